@@ -7,7 +7,9 @@ variable renaming, attribute assignments, and dataset standardization.
 
 import logging
 import os
-from datetime import datetime
+import re
+from datetime import datetime, timezone
+from itertools import repeat
 
 import numpy as np
 import xarray as xr
@@ -21,6 +23,7 @@ _log = logging.getLogger(__name__)
 def convert_to_OG1(
     list_of_datasets: list[xr.Dataset] | xr.Dataset,
     contrib_to_append: dict[str, str] | None = None,
+    date_modified: str | None = None,
 ) -> tuple[xr.Dataset, list[str]]:
     """Convert Seaglider basestation datasets to OG1 format.
     Processes a list of xarray datasets or a single xarray dataset, converts them to OG1 format,
@@ -34,6 +37,9 @@ def convert_to_OG1(
         A list of xarray datasets or a single xarray dataset in basestation format.
     contrib_to_append : dict of str, optional
         Dictionary containing additional contributor information to append. Default is None.
+    date_modified : str, optional
+        Modification timestamp (YYYYmmddTHHMMSS) to write to the date_modified attribute.
+        Default is None, which uses the time at the start of the conversion.
 
     Returns
     -------
@@ -45,15 +51,17 @@ def convert_to_OG1(
     """
     if not isinstance(list_of_datasets, list):
         list_of_datasets = [list_of_datasets]
+    if date_modified is None:
+        date_modified = datetime.now().strftime("%Y%m%dT%H%M%S")
 
     processed_datasets = []
     firstrun = True
 
-    varlist = []
+    varnames = set()
     # This would be faster if we concatenated the basestation files first, and then processed them.
     # But we need to process them first to get the dive number, assign GPS (could be after), ?
     for ds1_base in tqdm(list_of_datasets, desc="Processing datasets", unit="dataset"):
-        varlist = list(set(varlist + list(ds1_base.variables)))
+        varnames.update(ds1_base.variables)
         ds_new, attr_warnings, sg_cal, dc_other, dc_log = process_dataset(
             ds1_base, firstrun
         )
@@ -65,14 +73,14 @@ def convert_to_OG1(
                 f"Dataset for dive number {ds1_base.attrs['dive_number']} is empty or invalid."
             )
 
-    ds_og1 = xr.concat(processed_datasets, dim="N_MEASUREMENTS")
-    ds_og1 = ds_og1.sortby("TIME")
+    # Concatenate the dives and sort by time in a single numpy pass
+    ds_og1 = utilities._concat_sorted_by_time(processed_datasets, dim="N_MEASUREMENTS")
     # Change format of time into datetime64[ns] to avoid problems with attributes and writing to netcdf
     # ds_og1["TIME"] = (ds_og1["TIME"].astype("float64") * 1e9).astype("datetime64[ns]")
 
     # Apply attributes
     ordered_attributes = update_dataset_attributes(
-        list_of_datasets[0], contrib_to_append
+        list_of_datasets[0], contrib_to_append, date_modified
     )
     for key, value in ordered_attributes.items():
         ds_og1.attrs[key] = value
@@ -86,25 +94,27 @@ def convert_to_OG1(
         PLATFORM_SERIAL_NUMBER = ds1_base.attrs["platform_id"].lower()
     else:
         PLATFORM_SERIAL_NUMBER = "sg000"
-    ds_og1["PLATFORM_SERIAL_NUMBER"] = PLATFORM_SERIAL_NUMBER
-    ds_og1["PLATFORM_SERIAL_NUMBER"].attrs["long_name"] = "glider serial number"
+    ds_og1["PLATFORM_SERIAL_NUMBER"] = xr.DataArray(
+        PLATFORM_SERIAL_NUMBER, attrs={"long_name": "glider serial number"}
+    )
 
     # ---- Added some more mandatory variables from OG1 ----
     # Construct the platform model
     PLATFORM_MODEL = "University of Washington Seaglider M1 glider"
-    ds_og1["PLATFORM_MODEL"] = PLATFORM_MODEL
-    ds_og1["PLATFORM_MODEL"].attrs["long_name"] = "model of the glider"
-    ds_og1["PLATFORM_MODEL"].attrs[
-        "platform_model_vocabulary"
-    ] = "https://vocab.nerc.ac.uk/collection/B76/current/B7600024/"
+    ds_og1["PLATFORM_MODEL"] = xr.DataArray(
+        PLATFORM_MODEL,
+        attrs={
+            "long_name": "model of the glider",
+            "platform_model_vocabulary": "https://vocab.nerc.ac.uk/collection/B76/current/B7600024/",
+        },
+    )
 
     # WMO identifier
     if "wmo_identifier" in ds1_base.attrs:
         wmo_id = ds1_base.attrs["wmo_identifier"]
     else:
         wmo_id = "0000000"
-    ds_og1["WMO_IDENTIFIER"] = wmo_id
-    ds_og1["WMO_IDENTIFIER"].attrs["long_name"] = "wmo id"
+    ds_og1["WMO_IDENTIFIER"] = xr.DataArray(wmo_id, attrs={"long_name": "wmo id"})
 
     # Trajectory
     ds_og1["TRAJECTORY"] = (
@@ -114,15 +124,15 @@ def convert_to_OG1(
     ds_og1["TRAJECTORY"].attrs["cf_role"] = "trajectory_id"
 
     ds_og1["DEPLOYMENT_LATITUDE"] = xr.DataArray(
-        ds_og1.LATITUDE.values[~np.isnan(ds_og1.LATITUDE)][0],
+        utilities._first_valid(ds_og1.LATITUDE.values),
         attrs={"long_name": "latitude of deployment"},
     )
     ds_og1["DEPLOYMENT_LONGITUDE"] = xr.DataArray(
-        ds_og1.LONGITUDE.values[~np.isnan(ds_og1.LONGITUDE)][0],
+        utilities._first_valid(ds_og1.LONGITUDE.values),
         attrs={"long_name": "longitude of deployment"},
     )
     ds_og1["DEPLOYMENT_TIME"] = xr.DataArray(
-        ds_og1.TIME.values[~np.isnan(ds_og1.TIME)][0],
+        utilities._first_valid(ds_og1.TIME.values),
         attrs={"long_name": "time of deployment"},
     )
 
@@ -136,45 +146,41 @@ def convert_to_OG1(
     # CHECK LOGIC HERE: Should we be using the first and last time from the first and last dive?
     # Or is time_coverage_start from the base station file a better time to use?
     # Or is there an earlier TIME_GPS timestamp?
-    tstart_in_numpy_datetime64 = ds_og1.TIME[0].values
-    tend_in_numpy_datetime64 = ds_og1.TIME[-1].values
-    tstart_str = utilities._clean_time_string(
-        np.datetime_as_string(tstart_in_numpy_datetime64, unit="s")
-    )
-    tend_str = utilities._clean_time_string(
-        np.datetime_as_string(tend_in_numpy_datetime64, unit="s")
+    # Format the first and last times in a single conversion
+    tstart_str, tend_str = (
+        utilities._clean_time_string(tstr)
+        for tstr in np.datetime_as_string(ds_og1.TIME.values[[0, -1]], unit="s")
     )
     _log.info("Start of mission from TIME[0]: " + tstart_str)
     _log.info("End of mission from TIME[-1]: " + tend_str)
-    ds_og1.attrs["time_coverage_start"] = (
+    attrs = ds_og1.attrs
+    attrs["time_coverage_start"] = (
         tstart_str  # ds_og1.TIME[0].values.strftime('%Y%m%dT%H%M%S')
     )
-    ds_og1.attrs["time_coverage_end"] = (
+    attrs["time_coverage_end"] = (
         tend_str  # ds_og1.TIME[-1].values.strftime('%Y%m%dT%H%M%S')
     )
-    ds_og1.attrs["date_created"] = utilities._clean_time_string(
-        ds_og1.attrs["date_created"]
-    )
+    attrs["date_created"] = utilities._clean_time_string(attrs["date_created"])
 
     # Update geospatial attributes
     lat_min = ds_og1.LATITUDE.min().values
     lat_max = ds_og1.LATITUDE.max().values
     lon_min = ds_og1.LONGITUDE.min().values
     lon_max = ds_og1.LONGITUDE.max().values
-    ds_og1.attrs["geospatial_lat_min"] = lat_min
-    ds_og1.attrs["geospatial_lat_max"] = lat_max
-    ds_og1.attrs["geospatial_lon_min"] = lon_min
-    ds_og1.attrs["geospatial_lon_max"] = lon_max
+    attrs["geospatial_lat_min"] = lat_min
+    attrs["geospatial_lat_max"] = lat_max
+    attrs["geospatial_lon_min"] = lon_min
+    attrs["geospatial_lon_max"] = lon_max
     depth_min = ds_og1.DEPTH.min().values
     depth_max = ds_og1.DEPTH.max().values
-    ds_og1.attrs["geospatial_vertical_min"] = depth_min
-    ds_og1.attrs["geospatial_vertical_max"] = depth_max
+    attrs["geospatial_vertical_min"] = depth_min
+    attrs["geospatial_vertical_max"] = depth_max
 
     # Construct the unique identifier attribute
-    id = f"{PLATFORM_SERIAL_NUMBER}_{ds_og1.start_date}_delayed"
-    ds_og1.attrs["id"] = id
+    id = f"{PLATFORM_SERIAL_NUMBER}_{attrs['start_date']}_delayed"
+    attrs["id"] = id
 
-    return ds_og1, varlist
+    return ds_og1, list(varnames)
 
 
 def process_dataset(ds1_base: xr.Dataset, firstrun: bool = False) -> tuple[
@@ -333,69 +339,84 @@ def standardise_OG10(
         The standardized dataset in OG1 format.
 
     """
-    dsa = xr.Dataset()
-    dsa.attrs = ds.attrs
-    suffixes = ["", "_qc", "_raw", "_raw_qc"]
+    # Collect the standardised variables and build the dataset once at the end
+    dsa_vars = {}
+    qc_vars = []
+    # Map each basestation suffix to its OG1 counterpart
+    suffixes = {suffix: suffix.upper() for suffix in ["", "_qc", "_raw", "_raw_qc"]}
+    data_vars = set(ds.data_vars)
 
     # Set new dimension name
     newdim = vocabularies.dims_rename_dict["sg_data_point"]
     # Make a list with all variables not in the vocabularies, and log a warning for them at the end of the loop
     vars_not_in_vocab = []
+    # Look up the vocabularies once, outside the variable loop
+    standard_names = vocabularies.standard_names
+    vocab_attrs = vocabularies.vocab_attrs
+    unit1_to_unit2 = vocabularies.unit1_to_unit2
+    # Variables kept or removed on purpose, which need no warning
+    vars_known = {*vocabularies.vars_as_is, *vocabularies.vars_to_remove}
 
     # Rename variables according to the OG1 vocabulary
     for orig_varname in list(ds) + list(ds.coords):
         if "_qc" in orig_varname.lower():
             continue
-        if orig_varname in vocabularies.standard_names.keys():
-            OG1_name = vocabularies.standard_names[orig_varname]
-            var_values = ds[orig_varname].values
+        if orig_varname in standard_names:
+            OG1_name = standard_names[orig_varname]
+            OG1_attrs = vocab_attrs[OG1_name]
+            var_values = ds[orig_varname].data
             # Reformat units and convert units if necessary
             if "units" in ds[orig_varname].attrs:
                 orig_unit = tools.reformat_units_var(ds, orig_varname, unit_format)
-                if "units" in vocabularies.vocab_attrs[OG1_name]:
-                    new_unit = vocabularies.vocab_attrs[OG1_name].get("units")
+                if "units" in OG1_attrs:
+                    new_unit = OG1_attrs["units"]
                     if orig_unit != new_unit:
                         var_values, _ = tools.convert_units_var(
                             var_values,
                             orig_unit,
                             new_unit,
-                            vocabularies.unit1_to_unit2,
+                            unit1_to_unit2,
                             firstrun,
                         )
-            dsa[OG1_name] = ([newdim], var_values, vocabularies.vocab_attrs[OG1_name])
             # Pass attributes that aren't in standard OG1 vocab_attrs
+            var_attrs = dict(OG1_attrs)
             for key, val in ds[orig_varname].attrs.items():
-                if key not in dsa[OG1_name].attrs.keys():
-                    dsa[OG1_name].attrs[key] = val
+                var_attrs.setdefault(key, val)
+            dsa_vars[OG1_name] = ([newdim], var_values, var_attrs)
 
             # Add QC variables if they exist
-            for suffix in suffixes:
+            for suffix, suffix_OG1 in suffixes.items():
                 variant = orig_varname + suffix
-                variant_OG1 = OG1_name + suffix.upper()
-                if variant in list(ds):
-                    dsa[variant_OG1] = ([newdim], ds[variant].values, ds[variant].attrs)
+                variant_OG1 = OG1_name + suffix_OG1
+                if variant in data_vars:
+                    dsa_vars[variant_OG1] = (
+                        [newdim],
+                        ds[variant].data,
+                        ds[variant].attrs,
+                    )
                     # Should only be the root for *_qc variables
                     if "_qc" in variant:
-                        # Convert QC flags to int8 and add attributes
-                        dsa = tools.convert_qc_flags(dsa, variant_OG1)
+                        qc_vars.append(variant_OG1)
         else:
-            dsa[orig_varname] = (
+            dsa_vars[orig_varname] = (
                 [newdim],
-                ds[orig_varname].values,
+                ds[orig_varname].data,
                 ds[orig_varname].attrs,
             )
             ### Only log a warning for variables that aren't in the vocabularies and aren't in the list of variables to keep or remove
             ### Removed varaiables will be printed in the log as being removed, so no need to log a warning for them here.
-            if orig_varname not in (
-                *vocabularies.vars_as_is,
-                *vocabularies.vars_to_remove,
-            ):
+            if orig_varname not in vars_known:
                 vars_not_in_vocab.append(orig_varname)
 
     if firstrun and vars_not_in_vocab:
         _log.warning(
             f"Variables not in OG1 vocabulary and not removed: {vars_not_in_vocab}"
         )
+    dsa = xr.Dataset(dsa_vars, attrs=ds.attrs)
+    # Convert QC flags to int8 and add attributes
+    for qc_name in qc_vars:
+        dsa = tools.convert_qc_flags(dsa, qc_name)
+
     # Assign coordinates
     dsa = dsa.set_coords(["LONGITUDE", "LATITUDE", "DEPTH", "TIME"])
     dsa = tools.encode_times_og1(dsa)
@@ -431,21 +452,25 @@ def extract_variables(ds: xr.Dataset) -> tuple[xr.Dataset, xr.Dataset, xr.Datase
             and other variables like `magnetic_variation`.
 
     """
-    sg_cal_vars = {var: ds[var] for var in ds.variables if var.startswith("sg_cal")}
-    divecycle_other = {
-        var: ds[var] for var in ds.variables if not var.startswith("sg_cal")
-    }
-    dc_log_vars = {var: ds[var] for var in divecycle_other if var.startswith("log_")}
-    divecycle_other = {
-        var: data for var, data in divecycle_other.items() if not var.startswith("log_")
-    }
+    # Classify each variable name in a single pass
+    sg_cal_prefix = "sg_cal_"
+    sg_cal_vars = []
+    dc_log_vars = []
+    divecycle_other = []
+    for var in ds.variables:
+        if var.startswith(sg_cal_prefix):
+            sg_cal_vars.append(var)
+        elif var.startswith("log_"):
+            dc_log_vars.append(var)
+        else:
+            divecycle_other.append(var)
 
-    # Create a new dataset with these variables, renaming to remove the leading 'sg_cal_'
-    sg_cal = xr.Dataset(
-        {var.replace("sg_cal_", ""): data for var, data in sg_cal_vars.items()}
+    # Subset the dataset, renaming to remove the leading 'sg_cal_'
+    sg_cal = ds[sg_cal_vars].rename(
+        {var: var[len(sg_cal_prefix) :] for var in sg_cal_vars}
     )
-    dc_other = xr.Dataset(divecycle_other)
-    dc_log = xr.Dataset(dc_log_vars)
+    dc_other = ds[divecycle_other]
+    dc_log = ds[dc_log_vars]
 
     return sg_cal, dc_log, dc_other
 
@@ -482,44 +507,41 @@ def add_gps_info_to_dataset(ds: xr.Dataset, gps_ds: xr.Dataset) -> xr.Dataset:
     # Set new dimension name
     newdim = vocabularies.dims_rename_dict["sg_data_point"]
 
-    # Create a new dataset with GPS information
+    # Create a new dataset with GPS information in a single constructor call
+    gps_lat = gps_ds["log_gps_lat"].values
+    gps_lon = gps_ds["log_gps_lon"].values
+    gps_time = gps_ds["log_gps_time"].values
     gps_ds = xr.Dataset(
         {
-            "LONGITUDE": ([newdim], gps_ds["log_gps_lon"].values),
+            "LATITUDE_GPS": (
+                [newdim],
+                gps_lat,
+                vocabularies.vocab_attrs["LATITUDE_GPS"],
+                {"dtype": ds["LATITUDE"].dtype},
+            ),
+            "LONGITUDE_GPS": (
+                [newdim],
+                gps_lon,
+                vocabularies.vocab_attrs["LONGITUDE_GPS"],
+                {"dtype": ds["LONGITUDE"].dtype},
+            ),
+            "TIME_GPS": (
+                [newdim],
+                gps_time,
+                vocabularies.vocab_attrs["TIME_GPS"],
+                {"dtype": ds["TIME"].dtype},
+            ),
         },
         coords={
-            "LATITUDE": ([newdim], gps_ds["log_gps_lat"].values),
-            "TIME": ([newdim], gps_ds["log_gps_time"].values),
-            "DEPTH": ([newdim], np.full(len(gps_ds["log_gps_lat"]), 0)),
+            "LONGITUDE": ([newdim], gps_lon),
+            "LATITUDE": ([newdim], gps_lat),
+            "TIME": ([newdim], gps_time),
+            "DEPTH": ([newdim], np.full(len(gps_lat), 0)),
         },
     )
-    gps_ds = gps_ds.set_coords("LONGITUDE")
 
-    gps_ds["LATITUDE_GPS"] = (
-        [newdim],
-        gps_ds.LATITUDE.values,
-        vocabularies.vocab_attrs["LATITUDE_GPS"],
-        {"dtype": ds["LATITUDE"].dtype},
-    )
-    gps_ds["LONGITUDE_GPS"] = (
-        [newdim],
-        gps_ds.LONGITUDE.values,
-        vocabularies.vocab_attrs["LONGITUDE_GPS"],
-        {"dtype": ds["LONGITUDE"].dtype},
-    )
-    gps_ds["TIME_GPS"] = (
-        [newdim],
-        gps_ds.TIME.values,
-        vocabularies.vocab_attrs["TIME_GPS"],
-        {"dtype": ds["TIME"].dtype},
-    )
-
-    # Concatenate ds and gps_ds
-    datasets = []
-    datasets.append(ds)
-    datasets.append(gps_ds)
-    ds_new = xr.concat(datasets, dim=newdim, data_vars="all")
-    ds_new = ds_new.sortby("TIME")
+    # Concatenate ds and gps_ds, sorted by TIME
+    ds_new = utilities._concat_sorted_by_time([ds, gps_ds], dim=newdim)
 
     return ds_new
 
@@ -528,7 +550,9 @@ def add_gps_info_to_dataset(ds: xr.Dataset, gps_ds: xr.Dataset) -> xr.Dataset:
 ## Editing attributes
 ##-----------------------------------------------------------------------------------------
 def update_dataset_attributes(
-    ds: xr.Dataset, contrib_to_append: dict[str, str] | None
+    ds: xr.Dataset,
+    contrib_to_append: dict[str, str] | None,
+    date_modified: str | None = None,
 ) -> dict[str, str]:
     """Update the attributes of the dataset based on the provided attribute input.
 
@@ -541,6 +565,8 @@ def update_dataset_attributes(
         The input dataset whose attributes need to be updated.
     contrib_to_append : dict of str or None
         A dictionary containing additional contributor information to append. Default is None.
+    date_modified : str, optional
+        Modification timestamp passed on to get_time_attributes. Default is None.
 
     Returns
     -------
@@ -558,7 +584,7 @@ def update_dataset_attributes(
     contrib_attrs = get_contributors(ds, contrib_to_append)
 
     # Extract time attributes and reformat basic time strings
-    time_attrs = get_time_attributes(ds)
+    time_attrs = get_time_attributes(ds, date_modified)
 
     # Rename some
     renamed_attrs = extract_attr_to_rename(ds, attr_to_rename)
@@ -594,6 +620,29 @@ def update_dataset_attributes(
     return ordered_attributes
 
 
+# Person attribute fields (after the creator_/contributor_ prefix) and their defaults
+_contributor_fields = {
+    "name": "",
+    "email": "",
+    "role": "PI",
+    "role_vocabulary": "http://vocab.nerc.ac.uk/search_nvs/W08",
+}
+
+# Institution attribute fields (after the contributing_institutions prefix) and their defaults
+_institution_fields = {
+    "": "",
+    "_role": "Operator",
+    "_vocabulary": "https://edmo.seadatanet.org/report/1434",
+    "_role_vocabulary": "http://vocab.nerc.ac.uk/collection/W08/current/",
+}
+
+# Institutions mentioning all of these keywords are renamed to the canonical name
+_uw_oceanography = "University of Washington - School of Oceanography"
+_uw_oceanography_re = re.compile(
+    r"^(?=.*Oceanography)(?=.*University)(?=.*Washington)", re.DOTALL
+)
+
+
 def get_contributors(
     ds: xr.Dataset, values_to_append: dict[str, str] | None = None
 ) -> dict[str, str]:
@@ -616,12 +665,21 @@ def get_contributors(
 
     """
 
-    # Function to create or append to a list
+    # Function to append to a list in place, skipping duplicates
     def create_or_append_list(existing_list, new_item):
         if new_item not in existing_list:
-            new_item = new_item.replace(",", "-")
             existing_list.append(new_item)
-        return existing_list
+
+    def pad_list(lst, length):
+        """Pad a list in place with empty strings up to the given length."""
+        lst.extend(repeat("", length - len(lst)))
+
+    def replace_commas(attrs):
+        """Replace commas in string values with hyphens, as values are later joined by commas."""
+        return {
+            key: value.replace(",", "-") if isinstance(value, str) else value
+            for key, value in attrs.items()
+        }
 
     def list_to_comma_separated_string(lst):
         """Convert a list of strings to a single string with values separated by commas.
@@ -639,160 +697,77 @@ def get_contributors(
             Comma-separated string with commas in elements replaced by hyphens.
 
         """
-        return ", ".join([item for item in lst])
-
-    new_attributes = ds.attrs
-
-    # Initialize empty lists for creator/contributor information and institutions if they are not present
-    names = []
-    emails = []
-    roles = []
-    roles_vocab = []
-    insts = []
-    inst_roles = []
-    inst_vocab = []
-    inst_roles_vocab = []
-    # Parse the original attributes into lists
-    if "creator_name" in new_attributes:
-        names = create_or_append_list([], new_attributes["creator_name"])
-        emails = create_or_append_list([], new_attributes.get("creator_email", ""))
-        roles = create_or_append_list([], new_attributes.get("creator_role", "PI"))
-        roles_vocab = create_or_append_list(
-            [],
-            new_attributes.get(
-                "creator_role_vocabulary", "http://vocab.nerc.ac.uk/search_nvs/W08"
-            ),
-        )
-        if "contributor_name" in new_attributes:
-            names = create_or_append_list(names, new_attributes["contributor_name"])
-            emails = create_or_append_list(
-                emails, new_attributes.get("contributor_email", "")
-            )
-            roles = create_or_append_list(
-                roles, new_attributes.get("contributor_role", "PI")
+        return ", ".join(lst)
+
+    # Only the creator, contributor and institution attributes end up in the lists
+    new_attributes = replace_commas(
+        {
+            key: value
+            for key, value in ds.attrs.items()
+            if key.startswith(
+                ("creator_", "contributor_", "contributing_", "institution")
             )
-            roles_vocab = create_or_append_list(
-                roles_vocab,
-                new_attributes.get(
-                    "contributor_role_vocabulary",
-                    "http://vocab.nerc.ac.uk/search_nvs/W08",
-                ),
+        }
+    )
+    if values_to_append:
+        values_to_append = replace_commas(values_to_append)
+
+    # Initialize empty lists for contributor and institution information, keyed by output attribute
+    person_keys = [f"contributor_{field}" for field in _contributor_fields]
+    inst_keys = [f"contributing_institutions{suffix}" for suffix in _institution_fields]
+    lists = {key: [] for key in (*person_keys, *inst_keys)}
+
+    # Parse the original attributes into lists: creator first, then contributor
+    for prefix in ["creator", "contributor"]:
+        if f"{prefix}_name" not in new_attributes:
+            continue
+        for key, (field, default) in zip(person_keys, _contributor_fields.items()):
+            create_or_append_list(
+                lists[key], new_attributes.get(f"{prefix}_{field}", default)
             )
-    elif "contributor_name" in new_attributes:
-        names = create_or_append_list([], new_attributes["contributor_name"])
-        emails = create_or_append_list([], new_attributes.get("contributor_email", ""))
-        roles = create_or_append_list([], new_attributes.get("contributor_role", "PI"))
-        roles_vocab = create_or_append_list(
-            [],
-            new_attributes.get(
-                "contributor_role_vocabulary", "http://vocab.nerc.ac.uk/search_nvs/W08"
-            ),
-        )
-    if "contributing_institutions" in new_attributes:
-        insts = create_or_append_list(
-            [], new_attributes.get("contributing_institutions", "")
-        )
-        inst_roles = create_or_append_list(
-            [], new_attributes.get("contributing_institutions_role", "Operator")
-        )
-        inst_vocab = create_or_append_list(
-            [],
-            new_attributes.get(
-                "contributing_institutions_vocabulary",
-                "https://edmo.seadatanet.org/report/1434",
-            ),
-        )
-        inst_roles_vocab = create_or_append_list(
-            [],
-            new_attributes.get(
-                "contributing_institutions_role_vocabulary",
-                "http://vocab.nerc.ac.uk/collection/W08/current/",
-            ),
-        )
-    elif "institution" in new_attributes:
-        insts = create_or_append_list([], new_attributes["institution"])
-        inst_roles = create_or_append_list(
-            [], new_attributes.get("contributing_institutions_role", "PI")
-        )
-        inst_vocab = create_or_append_list(
-            [],
-            new_attributes.get(
-                "contributing_institutions_vocabulary",
-                "https://edmo.seadatanet.org/report/1434",
-            ),
-        )
-        inst_roles_vocab = create_or_append_list(
-            [],
-            new_attributes.get(
-                "contributing_institutions_role_vocabulary",
-                "http://vocab.nerc.ac.uk/collection/W08/current/",
-            ),
-        )
+    if "contributing_institutions" in new_attributes or "institution" in new_attributes:
+        inst_defaults = dict(_institution_fields)
+        if "contributing_institutions" not in new_attributes:
+            # Fall back on the institution attribute, with the PI role
+            inst_defaults.update({"": new_attributes["institution"], "_role": "PI"})
+        for key, default in zip(inst_keys, inst_defaults.values()):
+            create_or_append_list(lists[key], new_attributes.get(key, default))
 
     # Rename specific institution if it matches criteria
-    for i, inst in enumerate(insts):
-        if all(
-            keyword in inst for keyword in ["Oceanography", "University", "Washington"]
-        ):
-            insts[i] = "University of Washington - School of Oceanography"
-
-    # Pad the lists if they are shorter than names
-    max_length = len(names)
-    emails += [""] * (max_length - len(emails))
-    roles += [""] * (max_length - len(roles))
-    roles_vocab += [""] * (max_length - len(roles_vocab))
-    insts += [""] * (max_length - len(insts))
-    inst_roles += [""] * (max_length - len(inst_roles))
-    inst_vocab += [""] * (max_length - len(inst_vocab))
-    inst_roles_vocab += [""] * (max_length - len(inst_roles_vocab))
+    lists["contributing_institutions"][:] = [
+        _uw_oceanography if _uw_oceanography_re.search(inst) else inst
+        for inst in lists["contributing_institutions"]
+    ]
+
+    # Pad the lists if they are shorter than names (nothing to pad without names)
+    max_length = len(lists["contributor_name"])
+    if max_length:
+        for lst in lists.values():
+            pad_list(lst, max_length)
 
     # Append new values to the lists
-    if values_to_append is not None:
+    if values_to_append:
         for key, value in values_to_append.items():
-            if key == "contributor_name":
-                names = create_or_append_list(names, value)
-            elif key == "contributor_email":
-                emails = create_or_append_list(emails, value)
-            elif key == "contributor_role":
-                roles = create_or_append_list(roles, value)
-            elif key == "contributor_role_vocabulary":
-                roles_vocab = create_or_append_list(roles_vocab, value)
-            elif key == "contributing_institutions":
-                insts = create_or_append_list(insts, value)
-            elif key == "contributing_institutions_role":
-                inst_roles = create_or_append_list(inst_roles, value)
-            elif key == "contributing_institutions_vocabulary":
-                inst_vocab = create_or_append_list(inst_vocab, value)
-            elif key == "contributing_institutions_role_vocabulary":
-                inst_roles_vocab = create_or_append_list(inst_roles_vocab, value)
+            target = lists.get(key)
+            if target is not None:
+                create_or_append_list(target, value)
 
     # Turn the lists into comma-separated strings
-    names_str = list_to_comma_separated_string(names)
-    emails_str = list_to_comma_separated_string(emails)
-    roles_str = list_to_comma_separated_string(roles)
-    roles_vocab_str = list_to_comma_separated_string(roles_vocab)
-
-    insts_str = list_to_comma_separated_string(insts)
-    inst_roles_str = list_to_comma_separated_string(inst_roles)
-    inst_vocab_str = list_to_comma_separated_string(inst_vocab)
-    inst_roles_vocab_str = list_to_comma_separated_string(inst_roles_vocab)
-
-    # Create a dictionary for return
-    attributes_dict = {
-        "contributor_name": names_str,
-        "contributor_email": emails_str,
-        "contributor_role": roles_str,
-        "contributor_role_vocabulary": roles_vocab_str,
-        "contributing_institutions": insts_str,
-        "contributing_institutions_role": inst_roles_str,
-        "contributing_institutions_vocabulary": inst_vocab_str,
-        "contributing_institutions_role_vocabulary": inst_roles_vocab_str,
-    }
+    return {key: list_to_comma_separated_string(lst) for key, lst in lists.items()}
+
 
-    return attributes_dict
+# Time attributes read from the dataset by get_time_attributes
+_time_attr_names = (
+    "time_coverage_start",
+    "time_coverage_end",
+    "date_created",
+    "start_time",
+)
 
 
-def get_time_attributes(ds: xr.Dataset) -> dict[str, str]:
+def get_time_attributes(
+    ds: xr.Dataset, date_modified: str | None = None
+) -> dict[str, str]:
     """Extract and clean time-related attributes from the dataset.
 
     Converts various time formats to OG1-standard YYYYMMDDTHHMMSS format
@@ -802,6 +777,8 @@ def get_time_attributes(ds: xr.Dataset) -> dict[str, str]:
     ----------
     ds : xarray.Dataset
         The input dataset containing various attributes.
+    date_modified : str, optional
+        Modification timestamp (YYYYmmddTHHMMSS). Default is None, which uses the current time.
 
     Returns
     -------
@@ -810,21 +787,21 @@ def get_time_attributes(ds: xr.Dataset) -> dict[str, str]:
 
     """
     time_attrs = {}
-    time_attr_list = [
-        "time_coverage_start",
-        "time_coverage_end",
-        "date_created",
-        "start_time",
-    ]
-    for attr in time_attr_list:
-        if attr in ds.attrs:
-            val1 = ds.attrs[attr]
+    attrs = ds.attrs
+    clean_time_string = utilities._clean_time_string
+    for attr in _time_attr_names:
+        if attr in attrs:
+            val1 = attrs[attr]
             if isinstance(val1, (int, float)):
-                val1 = datetime.utcfromtimestamp(val1).strftime("%Y%m%dT%H%M%S")
+                val1 = datetime.fromtimestamp(val1, timezone.utc).strftime(
+                    "%Y%m%dT%H%M%S"
+                )
             if isinstance(val1, str) and ("-" in val1 or ":" in val1):
-                val1 = utilities._clean_time_string(val1)
+                val1 = clean_time_string(val1)
             time_attrs[attr] = val1
-    time_attrs["date_modified"] = datetime.now().strftime("%Y%m%dT%H%M%S")
+    if date_modified is None:
+        date_modified = datetime.now().strftime("%Y%m%dT%H%M%S")
+    time_attrs["date_modified"] = date_modified
 
     # Handle start_date attribute
     if "start_time" in time_attrs:
@@ -853,14 +830,8 @@ def extract_attr_to_keep(
         Retained attributes.
 
     """
-    retained_attrs = {}
-
-    # Retain attributes based on attr_as_is
-    for attr in attr_as_is:
-        if attr in ds1.attrs:
-            retained_attrs[attr] = ds1.attrs[attr]
-
-    return retained_attrs
+    # Retain attributes based on attr_as_is, in the order given
+    return {attr: ds1.attrs[attr] for attr in attr_as_is if attr in ds1.attrs}
 
 
 def extract_attr_to_rename(
@@ -882,13 +853,13 @@ def extract_attr_to_rename(
         Renamed attributes.
 
     """
-    renamed_attrs = {}
     # Rename attributes based on values_to_rename
-    for new_attr, old_attr in attr_to_rename.items():
-        if old_attr in ds1.attrs:
-            renamed_attrs[new_attr] = ds1.attrs[old_attr]
-
-    return renamed_attrs
+    attrs = ds1.attrs
+    return {
+        new_attr: attrs[old_attr]
+        for new_attr, old_attr in attr_to_rename.items()
+        if old_attr in attrs
+    }
 
 
 def process_and_save_data(
@@ -919,11 +890,14 @@ def process_and_save_data(
     xarray.Dataset
         The processed dataset.
     """
+    # Use one modification timestamp for every conversion in this run
+    date_modified = datetime.now().strftime("%Y%m%dT%H%M%S")
+
     # Load and concatenate all datasets from the server
     ds1_base = readers.load_first_basestation_file(input_location)
 
     # Convert the list of datasets to OG1
-    ds1_og1, varlist = convert_to_OG1(ds1_base)
+    ds1_og1, varlist = convert_to_OG1(ds1_base, date_modified=date_modified)
     output_file = os.path.join(output_dir, ds1_og1.attrs["id"] + ".nc")
 
     # Check if the file exists and delete it if it does
@@ -941,7 +915,7 @@ def process_and_save_data(
             ds_all = xr.open_dataset(output_file)
             return ds_all
         elif user_input.lower() == "yes":
-            ds_all, varlist = convert_to_OG1(list_datasets)
+            ds_all, varlist = convert_to_OG1(list_datasets, date_modified=date_modified)
             os.remove(output_file)
             if save:
                 writers.save_dataset(ds_all, output_file)
@@ -949,7 +923,7 @@ def process_and_save_data(
         print("Running the directory:", input_location)
         _log.info(f"Running the directory: {input_location}")
         list_datasets = readers.load_basestation_files(input_location)
-        ds_all, varlist = convert_to_OG1(list_datasets)
+        ds_all, varlist = convert_to_OG1(list_datasets, date_modified=date_modified)
         output_file = os.path.join(output_dir, ds_all.attrs["id"] + ".nc")
         if save:
             writers.save_dataset(ds_all, output_file)
@@ -1,7 +1,9 @@
+import ast
+import json
 import numpy as np
 import pandas as pd
 import xarray as xr
-from seagliderOG1 import vocabularies
+from seagliderOG1 import utilities, vocabularies
 import gsw
 #import pandas as pd
 #import numpy as np
@@ -13,6 +15,18 @@ from datetime import datetime
 
 _log = logging.getLogger(__name__)
 
+# Lookup table from SeaExplorer nav_state codes to OG1 phase; unlisted codes map to 0
+nav_state_to_phase = np.zeros(125, dtype=int)
+nav_state_to_phase[[115, 116, 119]] = 3
+nav_state_to_phase[[110, 118]] = 5
+nav_state_to_phase[100] = 2
+nav_state_to_phase[117] = 1
+nav_state_to_phase[[123, 124]] = 4
+
+# QC flag attributes shared by every *_QC variable written by convert_to_og1
+qc_flag_values = np.array((1, 2, 3, 4, 9), dtype=np.int8)
+qc_flag_meanings = "GOOD UNKNOWN SUSPECT FAIL MISSING"
+
 
 
 
@@ -71,11 +85,10 @@ def rename_dimensions(ds, rename_dict=vocabularies.dims_rename_dict):
     Warning: If no variables with dimensions matching any key in rename_dict are found.
 
     """
-    # Check if there are any variables with dimensions matching 'sg_data_point'
-    matching_vars = [var for var in ds.variables if any(dim in ds[var].dims for dim in rename_dict.keys())]
-    if not matching_vars:
-        _log.warning("No variables with dimensions matching any key in rename_dict found.")
+    # A variable uses a dimension in rename_dict exactly when the dataset has that dimension
     dims_to_rename = {dim: rename_dict[dim] for dim in ds.dims if dim in rename_dict}
+    if not dims_to_rename:
+        _log.warning("No variables with dimensions matching any key in rename_dict found.")
     return ds.rename_dims(dims_to_rename)
 
 
@@ -110,22 +123,34 @@ variables_sensors = {
     "PRES_ADCP": "ADVs and turbulence probes",
 }
 
+def parse_dict_attr(value):
+    """Parse a dict-shaped string attribute, returning the dict or None if it is not one."""
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        try:
+            parsed = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return None
+    return parsed if isinstance(parsed, dict) else None
+
+
 def add_sensors(ds, dsa):
     attrs = ds.attrs
-    sensors = []
-    for key, var in attrs.items():
+    # Single pass: parse each dict-shaped attribute and add its sensor
+    sensor_name_type = {}
+    to_pop = []
+    for instr, var in attrs.items():
         if not isinstance(var, str):
             continue
-        if "{" not in var:
+        if not var.lstrip().startswith("{"):
             continue
-        if isinstance(eval(var), dict):
-            sensors.append(key)
-
-    sensor_name_type = {}
-    for instr in sensors:
+        attr_dict = parse_dict_attr(var)
+        if attr_dict is None:
+            continue
+        to_pop.append(instr)
         if instr in ["altimeter"]:
             continue
-        attr_dict = eval(attrs[instr])
         if attr_dict["make_model"] not in vocabularies.sensor_vocabs.keys():
             _log.error(f"sensor {attr_dict['make_model']} not found")
             continue
@@ -144,13 +169,8 @@ def add_sensors(ds, dsa):
         dsa[sensor_var_name] = da
         sensor_name_type[var_dict["sensor_type"]] = sensor_var_name
 
-    for key, var in attrs.copy().items():
-        if not isinstance(var, str):
-            continue
-        if "{" not in var:
-            continue
-        if isinstance(eval(var), dict):
-            attrs.pop(key)
+    for key in to_pop:
+        attrs.pop(key, None)
     ds.attrs = attrs
 
     for key, sensor_type in variables_sensors.items():
@@ -205,8 +225,8 @@ def convert_to_og1(ds, num_vals=None):
                 f'{dsa[var_name].attrs["long_name"]} Quality Flag'
             )
             dsa[qc_name].attrs["standard_name"] = "status_flag"
-            dsa[qc_name].attrs["flag_values"] = np.array((1, 2, 3, 4, 9)).astype("int8")
-            dsa[qc_name].attrs["flag_meanings"] = "GOOD UNKNOWN SUSPECT FAIL MISSING"
+            dsa[qc_name].attrs["flag_values"] = qc_flag_values
+            dsa[qc_name].attrs["flag_meanings"] = qc_flag_meanings
             dsa[var_name].attrs["ancillary_variables"] = qc_name
     if "time" in str(dsa.TIME.dtype):
         var_name = "TIME"
@@ -214,9 +234,10 @@ def convert_to_og1(ds, num_vals=None):
         if np.nanmean(dsa[var_name].values) > 1e12:
             dsa[var_name].values = dsa[var_name].values / 1e9
     dsa = dsa.set_coords(("TIME", "LATITUDE", "LONGITUDE", "DEPTH"))
+    not_gps_fix = dsa["nav_state"].values != 119
     for vname in ["LATITUDE", "LONGITUDE", "TIME"]:
         dsa[f"{vname}_GPS"] = dsa[vname].copy()
-        dsa[f"{vname}_GPS"].values[dsa["nav_state"].values != 119] = np.nan
+        dsa[f"{vname}_GPS"].values[not_gps_fix] = np.nan
         dsa[f"{vname}_GPS"].attrs["long_name"] = f"{vname.lower()} of each GPS location"
     dsa["LATITUDE_GPS"].attrs["URI"] = (
         "https://vocab.nerc.ac.uk/collection/OG1/current/LAT_GPS/"
@@ -226,15 +247,10 @@ def convert_to_og1(ds, num_vals=None):
     )
     seaex_phase = dsa["nav_state"].values
     standard_phase = np.zeros(len(seaex_phase)).astype(int)
-    standard_phase[seaex_phase == 115] = 3
-    standard_phase[seaex_phase == 116] = 3
-    standard_phase[seaex_phase == 119] = 3
-    standard_phase[seaex_phase == 110] = 5
-    standard_phase[seaex_phase == 118] = 5
-    standard_phase[seaex_phase == 100] = 2
-    standard_phase[seaex_phase == 117] = 1
-    standard_phase[seaex_phase == 123] = 4
-    standard_phase[seaex_phase == 124] = 4
+    # Map nav_state codes to OG1 phases with a single lookup-table gather
+    in_table = (seaex_phase >= 0) & (seaex_phase < len(nav_state_to_phase))
+    in_table &= seaex_phase % 1 == 0
+    standard_phase[in_table] = nav_state_to_phase[seaex_phase[in_table].astype(int)]
     dsa["PHASE"] = xr.DataArray(
         standard_phase,
         coords=dsa["LATITUDE"].coords,
@@ -444,20 +460,22 @@ def add_standard_global_attrs(ds):
 # Deprecated
 def add_sensors_old(ds, dsa):
     attrs = ds.attrs
-    sensors = []
+    # Parse each dict-shaped attribute once
+    sensors = {}
     for key, var in attrs.items():
         if not isinstance(var, str):
             continue
         if "{" not in var:
             continue
-        if isinstance(eval(var), dict):
-            sensors.append(key)
+        attr_dict = parse_dict_attr(var)
+        if attr_dict is not None:
+            sensors[key] = attr_dict
 
     sensor_name_type = {}
     for instr in sensors:
         if instr in ["altimeter"]:
             continue
-        attr_dict = eval(attrs[instr])
+        attr_dict = sensors[instr]
         if attr_dict["make_model"] not in vocabularies.sensor_vocabs.keys():
             _log.error(f"sensor {attr_dict['make_model']} not found")
             continue
@@ -476,13 +494,8 @@ def add_sensors_old(ds, dsa):
         dsa[sensor_var_name] = da
         sensor_name_type[var_dict["sensor_type"]] = sensor_var_name
 
-    for key, var in attrs.copy().items():
-        if not isinstance(var, str):
-            continue
-        if "{" not in var:
-            continue
-        if isinstance(eval(var), dict):
-            attrs.pop(key)
+    for key in sensors:
+        attrs.pop(key)
     ds.attrs = attrs
 
     for key, sensor_type in variables_sensors.items():
@@ -653,10 +666,10 @@ def generate_attributes(ds_all):
     platform = "sub-surface gliders"
     platform_vocabulary = "https://vocab.nerc.ac.uk/collection/L06/current/27/"
 
-    time_str = ds_all.time_coverage_start.replace('_', '').replace(':', '').rstrip('Z').rstrip('Z').replace('-','')
+    time_str = utilities._clean_time_string(ds_all.time_coverage_start)
     id = ds_all.platform_id + '_' + time_str + '_delayed'
     time_coverage_start = time_str
-    time_coverage_end = ds_all.time_coverage_end.replace('_', '').replace(':', '').rstrip('Z').replace('-','')
+    time_coverage_end = utilities._clean_time_string(ds_all.time_coverage_end)
 
     site = ds_all.summary
     contributor_name = ds_all.creator_name + ', ' + ds_all.contributor_name
@@ -672,7 +685,7 @@ def generate_attributes(ds_all):
     web_link = "https://www.ncei.noaa.gov/access/metadata/landing-page/bin/iso?id=gov.noaa.nodc:0111844"
     comment = "history: " + ds_all.history
     start_date = time_coverage_start
-    date_created = ds_all.date_created.replace('_', '').replace(':', '').rstrip('Z').rstrip('Z').replace('-','')
+    date_created = utilities._clean_time_string(ds_all.date_created)
     date_modified = datetime.now().strftime('%Y%m%dT%H%M%S')
     featureType = "trajectory"
     Conventions = "CF-1.10,OG-1.0"
@@ -759,19 +772,22 @@ def generate_attributes(ds_all):
     return attr_to_add, attr_as_is, attr_to_change, attr_to_remove
 
 
+# Order of global attributes written by modify_attributes
+_ordered_attributes = (
+    "title", "platform", "platform_vocabulary", "id", "naming_authority",
+    "institution", "geospatial_lat_min", "geospatial_lat_max",
+    "geospatial_lon_min", "geospatial_lon_max", "geospatial_vertical_min",
+    "geospatial_vertical_max", "time_coverage_start", "time_coverage_end",
+    "site", "project", "contributor_name", "contributor_email",
+    "contributor_role", "contributor_role_vocabulary", "uri", "data_url",
+    "doi", "rtqc_method", "rtqc_method_doi", "web_link", "comment",
+    "start_date", "date_created", "featureType", "Conventions"
+)
+_ordered_attributes_set = frozenset(_ordered_attributes)
+
+
 def modify_attributes(ds, attr_to_add, attr_as_is, attr_to_change, attr_to_remove):
 
-    # Define the order of attributes
-    ordered_attributes = [
-        "title", "platform", "platform_vocabulary", "id", "naming_authority",
-        "institution", "geospatial_lat_min", "geospatial_lat_max",
-        "geospatial_lon_min", "geospatial_lon_max", "geospatial_vertical_min",
-        "geospatial_vertical_max", "time_coverage_start", "time_coverage_end",
-        "site", "project", "contributor_name", "contributor_email",
-        "contributor_role", "contributor_role_vocabulary", "uri", "data_url",
-        "doi", "rtqc_method", "rtqc_method_doi", "web_link", "comment",
-        "start_date", "date_created", "featureType", "Conventions"
-    ]
     # Retain specified attributes
     new_attrs = {key: ds.attrs[key] for key in attr_as_is if key in ds.attrs}
 
@@ -789,20 +805,15 @@ def modify_attributes(ds, attr_to_add, attr_as_is, attr_to_change, attr_to_remov
         if key in new_attrs:
             del new_attrs[key]
 
-    ds.attrs = new_attrs
-
-    # Add the rest of the attributes that are present in the dataset but not in the ordered list
-    for attr in ds.attrs:
-        if attr not in ordered_attributes:
-            ordered_attributes.append(attr)
-
-    # Reorder the attributes in ds_new_att according to ordered_attributes
-    new_attrs = {attr: ds.attrs[attr] for attr in ordered_attributes if attr in ds.attrs}
-    for attr in ds.attrs:
-        if attr not in new_attrs:
-            new_attrs[attr] = ds.attrs[attr]
+    # Reorder the attributes according to _ordered_attributes, followed by the rest
+    ordered_attrs = {
+        attr: new_attrs[attr] for attr in _ordered_attributes if attr in new_attrs
+    }
+    for attr, value in new_attrs.items():
+        if attr not in _ordered_attributes_set:
+            ordered_attrs[attr] = value
 
-    ds.attrs = new_attrs
+    ds.attrs = ordered_attrs
     return ds
 
 if __name__ == "__main__":
@@ -886,19 +897,24 @@ def assign_profile_number(ds):
     # Initialize the new variable with the same dimensions as dive_num
     ds['dive_num_cast'] = (['N_MEASUREMENTS'], np.full(ds.dims['N_MEASUREMENTS'], np.nan))
 
+    # Pull the raw arrays out once rather than slicing DataArrays per dive
+    dive_num = ds['dive_num'].values
+    pres = ds['PRES'].values
+
     # Iterate over each unique dive_num
-    for dive in np.unique(ds['dive_num']):
+    for dive in np.unique(dive_num):
         # Get the indices for the current dive
-        dive_indices = np.where(ds['dive_num'] == dive)[0]
+        dive_indices = np.flatnonzero(dive_num == dive)
         # Find the start and end index for the current dive
         start_index = dive_indices[0]
         end_index = dive_indices[-1]
 
-        # Find the index of the maximum pressure between start_index and end_index
-        pmax = np.max(ds['PRES'][start_index:end_index + 1].values)
+        # Find the maximum pressure between start_index and end_index
+        pres_dive = pres[start_index:end_index + 1]
+        pmax = np.max(pres_dive)
 
         # Find the index where PRES attains the value pmax between start_index and end_index
-        pmax_index = start_index + np.argmax(ds['PRES'][start_index:end_index + 1].values == pmax)
+        pmax_index = start_index + np.argmax(pres_dive == pmax)
 
         # Assign dive_num to all values up to and including the point where pmax is reached
         ds['dive_num_cast'][start_index:pmax_index + 1] = dive
@@ -939,19 +955,24 @@ def assign_phase(ds):
     # Initialize the new variable PHASE_QC with the same dimensions as dive_num
     ds['PHASE_QC'] = (['N_MEASUREMENTS'], np.zeros(ds.dims['N_MEASUREMENTS'], dtype=int))
 
+    # Pull the raw arrays out once rather than slicing DataArrays per dive
+    dive_num = ds['dive_num'].values
+    pres = ds['PRES'].values
+
     # Iterate over each unique dive_num
-    for dive in np.unique(ds['dive_num']):
+    for dive in np.unique(dive_num):
         # Get the indices for the current dive
-        dive_indices = np.where(ds['dive_num'] == dive)[0]
+        dive_indices = np.flatnonzero(dive_num == dive)
         # Find the start and end index for the current dive
         start_index = dive_indices[0]
         end_index = dive_indices[-1]
 
-        # Find the index of the maximum pressure between start_index and end_index
-        pmax = np.max(ds['PRES'][start_index:end_index + 1].values)
+        # Find the maximum pressure between start_index and end_index
+        pres_dive = pres[start_index:end_index + 1]
+        pmax = np.max(pres_dive)
 
         # Find the index where PRES attains the value pmax between start_index and end_index
-        pmax_index = start_index + np.argmax(ds['PRES'][start_index:end_index + 1].values == pmax)
+        pmax_index = start_index + np.argmax(pres_dive == pmax)
 
         # Assign phase 2 to all values up to and including the point where pmax is reached
         ds['PHASE'][start_index:pmax_index + 1] = 2
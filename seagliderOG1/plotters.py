@@ -4,7 +4,6 @@ This module provides functions for plotting and inspecting Seaglider datasets,
 including variable summaries, attribute displays, and depth profile visualizations.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import xarray as xr
@@ -166,22 +165,23 @@ def show_attributes(data: str | xr.Dataset) -> pd.DataFrame:
 
     if isinstance(data, str):
         print("information is based on file: {}".format(data))
-        rootgrp = Dataset(data, "r", format="NETCDF4")
-        attributes = rootgrp.ncattrs()
-        get_attr = lambda key: getattr(rootgrp, key)
+        with Dataset(data, "r", format="NETCDF4") as rootgrp:
+            attributes = {key: rootgrp.getncattr(key) for key in rootgrp.ncattrs()}
     elif isinstance(data, xr.Dataset):
         print("information is based on xarray Dataset")
-        attributes = data.attrs.keys()
-        get_attr = lambda key: data.attrs[key]
+        attributes = data.attrs
     else:
         raise TypeError("Input data must be a file path (str) or an xarray Dataset")
 
-    info = {}
-    for i, key in enumerate(attributes):
-        dtype = type(get_attr(key)).__name__
-        info[i] = {"Attribute": key, "Value": get_attr(key), "DType": dtype}
-
-    attrs = DataFrame(info).T
+    # One record per attribute, built directly rather than as columns to transpose
+    attrs = DataFrame(
+        [
+            {"Attribute": key, "Value": value, "DType": type(value).__name__}
+            for key, value in attributes.items()
+        ],
+        columns=["Attribute", "Value", "DType"],
+        dtype=object,
+    )
 
     return attrs
 
@@ -263,6 +263,44 @@ def show_variables_by_dimension(data: str | xr.Dataset, dimension_name: str = "t
 ##----------------------------------------------------------------------------
 ## Sawtooth plots
 ##----------------------------------------------------------------------------
+def _depth_limits(ctd_depth) -> list[float]:
+    """Round the depth range outwards to the nearest 10 meters.
+
+    Parameters
+    ----------
+    ctd_depth : array-like
+        The plotted depth values.
+
+    Returns
+    -------
+    list of float
+        [y_min, y_max] for the depth axis.
+
+    """
+    return [np.floor(ctd_depth.min() / 10) * 10, np.ceil(ctd_depth.max() / 10) * 10]
+
+
+def _time_label(ctd_time) -> str:
+    """Build a time axis label with the year or year range of the data.
+
+    Parameters
+    ----------
+    ctd_time : array-like
+        The plotted time values.
+
+    Returns
+    -------
+    str
+        'Time (YYYY)' or 'Time (YYYY-YYYY)'.
+
+    """
+    # Convert the first and last times together
+    start_year, end_year = pd.to_datetime([ctd_time.min(), ctd_time.max()]).year
+    if start_year == end_year:
+        return f"Time ({start_year})"
+    return f"Time ({start_year}-{end_year})"
+
+
 def plot_profile_depth(data: pd.DataFrame | xr.Dataset) -> None:
     """Plot profile depth as a function of time.
 
@@ -290,6 +328,10 @@ def plot_profile_depth(data: pd.DataFrame | xr.Dataset) -> None:
         If required time or depth variables are not found in the dataset.
 
     """
+    # Only needed for plotting, so imported here to keep module import light
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+
     if isinstance(data, pd.DataFrame):
         ctd_time = data["ctd_time"]
         ctd_depth = data["ctd_depth"]
@@ -312,32 +354,35 @@ def plot_profile_depth(data: pd.DataFrame | xr.Dataset) -> None:
 
     # Reduce the number of points
     if len(ctd_time) > 100000:
-        indices = np.linspace(0, len(ctd_time) - 1, 100000).astype(int)
-        ctd_time = ctd_time[indices]
-        ctd_depth = ctd_depth[indices]
+        # Strided slice (a view for arrays) keeping at most 100000 points
+        step = -(-len(ctd_time) // 100000)
+        ctd_time = ctd_time[::step]
+        ctd_depth = ctd_depth[::step]
+
+    # Convert datetimes to matplotlib date numbers in one vectorised call,
+    # rather than through matplotlib's unit conversion inside plot
+    plot_time = np.asarray(ctd_time)
+    is_datetime = plot_time.dtype.kind == "M"
+    if is_datetime:
+        plot_time = mdates.date2num(plot_time)
 
     plt.figure(figsize=(10, 6))
-    plt.plot(ctd_time, ctd_depth, label="Profile Depth")
+    plt.plot(plot_time, ctd_depth, label="Profile Depth")
+    if is_datetime:
+        plt.gca().xaxis_date()
     plt.ylabel("Depth")
     plt.title("Profile Depth as a Function of Time")
     plt.legend()
     plt.grid(True)
 
     # Set y-axis limits to be tight around the data plotted to the nearest 10 meters
-    y_min = np.floor(ctd_depth.min() / 10) * 10
-    y_max = np.ceil(ctd_depth.max() / 10) * 10
-    plt.ylim([y_min, y_max])
+    plt.ylim(_depth_limits(ctd_depth))
     plt.gca().invert_yaxis()
 
     plt.gca().xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter("%b-%d"))
 
     # Add the year or year range to the xlabel
-    start_year = pd.to_datetime(ctd_time.min()).year
-    end_year = pd.to_datetime(ctd_time.max()).year
-    if start_year == end_year:
-        plt.xlabel(f"Time ({start_year})")
-    else:
-        plt.xlabel(f"Time ({start_year}-{end_year})")
+    plt.xlabel(_time_label(ctd_time))
 
     plt.show()
 
@@ -374,6 +419,9 @@ def plot_depth_colored(data: pd.DataFrame | xr.Dataset, color_by: str | None = N
         If no valid dive number variable is found in the dataset.
 
     """
+    # Only needed for plotting, so imported here to keep module import light
+    import matplotlib.pyplot as plt
+
     # Filter data by dive number if specified
     if "dive_number" in data.variables:
         divenum_str = "dive_number"
@@ -436,20 +484,13 @@ def plot_depth_colored(data: pd.DataFrame | xr.Dataset, color_by: str | None = N
     plt.grid(True)
 
     # Set y-axis limits to be tight around the data plotted to the nearest 10 meters
-    y_min = np.floor(ctd_depth.min() / 10) * 10
-    y_max = np.ceil(ctd_depth.max() / 10) * 10
-    plt.ylim([y_min, y_max])
+    plt.ylim(_depth_limits(ctd_depth))
     plt.gca().invert_yaxis()
 
     plt.gca().xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter("%b-%d"))
 
     # Add the year or year range to the xlabel
-    start_year = pd.to_datetime(ctd_time.min()).year
-    end_year = pd.to_datetime(ctd_time.max()).year
-    if start_year == end_year:
-        plt.xlabel(f"Time ({start_year})")
-    else:
-        plt.xlabel(f"Time ({start_year}-{end_year})")
+    plt.xlabel(_time_label(ctd_time))
 
     plt.show()
 
@@ -477,6 +518,9 @@ def plot_ctd_depth_vs_time(ds: xr.Dataset, start_traj: int | None = None, end_tr
     - Filters data by trajectory range if specified.
 
     """
+    # Only needed for plotting, so imported here to keep module import light
+    import matplotlib.pyplot as plt
+
     # Filter data by trajectory number if specified
     if start_traj is not None and end_traj is not None:
         ds = ds.where(
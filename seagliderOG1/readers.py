@@ -1,11 +1,10 @@
+import functools
 import os
 import pathlib
 import re
 import sys
 
-import requests
 import xarray as xr
-from bs4 import BeautifulSoup
 from tqdm import tqdm
 
 from datetime import datetime
@@ -280,6 +279,21 @@ def load_basestation_files(
     return datasets
 
 
+@functools.lru_cache(maxsize=1)
+def _http_session():
+    """Return a shared requests session, so repeated listings reuse connections.
+
+    Returns
+    -------
+    requests.Session
+        Session created on first use.
+
+    """
+    import requests
+
+    return requests.Session()
+
+
 def list_files(
     source: str,
     registry_loc: str = "seagliderOG1",
@@ -310,17 +324,20 @@ def list_files(
         If source is neither a valid URL nor directory path.
     """
     if source.startswith("http://") or source.startswith("https://"):
+        # Only needed for online sources, so imported here to keep module import light
+        from bs4 import BeautifulSoup, SoupStrainer
+
         # List all files in the URL directory
-        response = requests.get(source)
+        response = _http_session().get(source)
         response.raise_for_status()  # Raise an error for bad status codes
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        file_list = []
-
-        for link in soup.find_all("a"):
-            href = link.get("href")
-            if href and href.endswith(".nc"):
-                file_list.append(href)
+        # Only build the links into the parse tree, not the whole page
+        soup = BeautifulSoup(
+            response.text, "html.parser", parse_only=SoupStrainer("a", href=True)
+        )
+        file_list = [
+            link["href"] for link in soup.find_all("a") if link["href"].endswith(".nc")
+        ]
 
     elif os.path.isdir(source):
         ### only list files that are nc files
@@ -1,5 +1,4 @@
 import logging
-import re
 
 import gsw
 import numpy as np
@@ -120,6 +119,8 @@ def add_sensor_to_dataset(
         return dsa
     sensors = list(ds)
     sensor_name_type = {}
+    # Look up the calibcomm strings on the variables, without building DataArrays
+    sg_cal_vars = sg_cal.variables
     for instr in sensors:
         if firstrun:
             _log.info(instr)
@@ -134,7 +135,7 @@ def add_sensor_to_dataset(
                 _log.error(f"sensor {attr_dict['make_model']} not found")
             var_dict = vocabularies.sensor_vocabs[attr_dict["make_model"]]
 
-            calstr = sg_cal["calibcomm"].values.item().decode("utf-8")
+            calstr = sg_cal_vars["calibcomm"].values.item().decode("utf-8")
             if firstrun:
                 _log.info(f"sg_cal_calibcomm: {calstr}")
                 print(f"sg_cal_calibcomm: {calstr}")
@@ -189,20 +190,18 @@ def add_sensor_to_dataset(
             optode_flag = True
 
         if optode_flag:
-            if "calibcomm_oxygen" in sg_cal:
-                calstr = sg_cal["calibcomm_oxygen"].values.item().decode("utf-8")
-                if firstrun:
-                    _log.info(f"sg_cal_calibcomm_oxygen: {calstr}")
-                    print(f"sg_cal_calibcomm_oxygen: {calstr}")
-
-                cal_date, serial_number = utilities._parse_calibcomm(calstr, firstrun)
-            elif "calibcomm_optode" in sg_cal:
-                calstr = sg_cal["calibcomm_optode"].values.item().decode("utf-8")
-                if firstrun:
-                    _log.info(f"sg_cal_calibcomm_optode: {calstr}")
-                    print(f"sg_cal_calibcomm_optode: {calstr}")
-
-                cal_date, serial_number = utilities._parse_calibcomm(calstr, firstrun)
+            # Prefer calibcomm_oxygen, falling back on calibcomm_optode
+            for calibcomm_name in ("calibcomm_oxygen", "calibcomm_optode"):
+                if calibcomm_name in sg_cal_vars:
+                    calstr = sg_cal_vars[calibcomm_name].values.item().decode("utf-8")
+                    if firstrun:
+                        _log.info(f"sg_cal_{calibcomm_name}: {calstr}")
+                        print(f"sg_cal_{calibcomm_name}: {calstr}")
+
+                    cal_date, serial_number = utilities._parse_calibcomm(
+                        calstr, firstrun
+                    )
+                    break
             var_dict["serial_number"] = serial_number
             var_dict["long_name"] += f":{serial_number}"
             var_dict["calibration_date"] = cal_date
@@ -349,70 +348,111 @@ def assign_profile_number(ds: xr.Dataset, ds1: xr.Dataset) -> xr.Dataset:
     - Profile numbers: descent = 2*dive-1, ascent = 2*dive
 
     """
-    # Remove the variable dive_num_cast if it exists
-    if "dive_num_cast" in ds.variables:
-        ds = ds.drop_vars("dive_num_cast")
-
-    # Initialize the new variable with the same dimensions as dive_num
-    ds["dive_num_cast"] = (
-        ["N_MEASUREMENTS"],
-        np.full(ds.sizes["N_MEASUREMENTS"], np.nan),
-    )
+    # Remove dive_num_cast and PROFILE_NUMBER if they exist, in a single call
+    vars_to_drop = [
+        var for var in ["dive_num_cast", "PROFILE_NUMBER"] if var in ds.variables
+    ]
+    if vars_to_drop:
+        ds = ds.drop_vars(vars_to_drop)
 
     ds = add_dive_number(ds, ds1.attrs["dive_number"])
 
-    # Iterate over each unique dive_num
-    for dive in np.unique(ds["DIVE_NUMBER"]):
-        # Get the indices for the current dive
-        dive_indices = np.where(ds["DIVE_NUMBER"] == dive)[0]
-        if len(dive_indices) == 0:
-            continue  # Skip if no indices found
+    # Check for possible pressure variable names in ds, then ds1
+    possible_press_names = ["PRES", "ctd_pressure", "Pressure", "pres"]
+    press_var = next((var for var in possible_press_names if var in ds.variables), None)
 
-        # Find the start and end index for the current dive
-        start_index = dive_indices[0]
-        end_index = dive_indices[-1]
-
-        # Check for possible pressure variable names in ds, then ds1
-        possible_press_names = ["PRES", "ctd_pressure", "Pressure", "pres"]
+    if press_var is None:
         press_var = next(
-            (var for var in possible_press_names if var in ds.variables), None
+            (var for var in possible_press_names if var in ds1.variables), None
         )
 
-        if press_var is None:
-            press_var = next(
-                (var for var in possible_press_names if var in ds1.variables), None
-            )
+    if press_var is None:
+        raise ValueError(
+            "No valid pressure variable (PRES or pressure) found in ds or ds1"
+        )
 
-        if press_var is None:
-            raise ValueError(
-                "No valid pressure variable (PRES or pressure) found in ds or ds1"
-            )
+    # Get pressure values from the correct dataset
+    pressure_data = ds[press_var] if press_var in ds.variables else ds1[press_var]
 
-        # Get pressure values from the correct dataset
-        pressure_data = ds[press_var] if press_var in ds.variables else ds1[press_var]
+    dive_numbers = ds["DIVE_NUMBER"].values
+    pmax_index = _dive_pmax_index(dive_numbers, pressure_data.values)
 
-        # Find the maximum pressure value between start_index and end_index
-        pmax = np.nanmax(pressure_data[start_index : end_index + 1].values)
+    # Assign dive_num to all values up to and including pmax, dive_num + 0.5 after
+    dive_num_cast = np.where(
+        np.arange(len(dive_numbers)) <= pmax_index, dive_numbers, dive_numbers + 0.5
+    )
+    dive_num_cast[np.isnan(pmax_index)] = np.nan
 
-        # Find the index where PRES attains pmax
-        pmax_index = start_index + np.argmax(
-            pressure_data[start_index : end_index + 1].values == pmax
-        )
+    # Assign dive_num_cast and PROFILE_NUMBER together
+    ds = ds.assign(
+        dive_num_cast=(["N_MEASUREMENTS"], dive_num_cast),
+        PROFILE_NUMBER=(["N_MEASUREMENTS"], 2 * dive_num_cast - 1),
+    )
 
-        # Assign dive_num to all values up to and including pmax
-        ds["dive_num_cast"][start_index : pmax_index + 1] = dive
+    return ds
 
-        # Assign dive_num + 0.5 to values after pmax
-        ds["dive_num_cast"][pmax_index + 1 : end_index + 1] = dive + 0.5
 
-        # Remove PROFILE_NUMBER if it exists
-        if "PROFILE_NUMBER" in ds.variables:
-            ds = ds.drop_vars("PROFILE_NUMBER")
+def _dive_groups(dive_numbers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Group measurements by dive number in a single pass.
 
-        # Assign PROFILE_NUMBER
-        ds["PROFILE_NUMBER"] = 2 * ds["dive_num_cast"] - 1
+    Parameters
+    ----------
+    dive_numbers
+        Dive number of each measurement.
 
-    return ds
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The group id of each measurement (dives in ascending order) and the number
+        of measurements in each group. NaN dive numbers share a single last group.
+
+    """
+    _, dive_ids, dive_sizes = np.unique(
+        dive_numbers, return_inverse=True, return_counts=True
+    )
+    return dive_ids, dive_sizes
+
+
+def _dive_pmax_index(
+    dive_numbers: np.ndarray,
+    pressure: np.ndarray,
+    groups: tuple[np.ndarray, np.ndarray] | None = None,
+) -> np.ndarray:
+    """Locate the maximum pressure of each dive, broadcast back to every measurement.
+
+    Parameters
+    ----------
+    dive_numbers
+        Dive number of each measurement.
+    pressure
+        Pressure of each measurement, aligned with `dive_numbers`.
+    groups, optional
+        The output of `_dive_groups` for `dive_numbers`, if already computed.
+
+    Returns
+    -------
+    numpy.ndarray
+        For each measurement, the index of the first occurrence of the maximum
+        pressure within its dive. NaN where the dive number is NaN.
+
+    Notes
+    -----
+    NaN pressures are ignored. A dive with no valid pressure returns the index of its
+    first measurement.
+
+    """
+    if len(dive_numbers) == 0:
+        return np.array([], dtype=float)
+
+    dive_ids, dive_sizes = groups if groups is not None else _dive_groups(dive_numbers)
+    pressure = np.where(np.isnan(pressure), -np.inf, pressure)
+
+    # Stable sort by dive, then by decreasing pressure: each dive starts with its pmax
+    order = np.lexsort((-pressure, dive_ids))
+    dive_starts = np.concatenate(([0], np.cumsum(dive_sizes)[:-1]))
+    pmax_index = order[dive_starts][dive_ids].astype(float)
+    pmax_index[np.isnan(dive_numbers)] = np.nan
+    return pmax_index
 
 
 def assign_phase(ds: xr.Dataset) -> xr.Dataset:
@@ -448,44 +488,48 @@ def assign_phase(ds: xr.Dataset) -> xr.Dataset:
         divenum_str = "DIVE_NUMBER"
     else:
         raise ValueError("No valid dive number variable found in the dataset.")
-    # Initialize the new variable with the same dimensions as dive_num
-    ds["PHASE"] = (["N_MEASUREMENTS"], np.full(ds.sizes["N_MEASUREMENTS"], np.nan))
-    # Initialize the new variable PHASE_QC with the same dimensions as dive_num
-    ds["PHASE_QC"] = (
-        ["N_MEASUREMENTS"],
-        np.zeros(ds.sizes["N_MEASUREMENTS"], dtype=int),
-    )
-
-    # Iterate over each unique dive_num
-    for dive in np.unique(ds[divenum_str]):
-        # Get the indices for the current dive
-        dive_indices = np.where(ds[divenum_str] == dive)[0]
-        # Find the start and end index for the current dive
-        start_index = dive_indices[0]
-        end_index = dive_indices[-1]
-
-        # Find the index of the maximum pressure between start_index and end_index
-        pmax = np.nanmax(ds["PRES"][start_index : end_index + 1].values)
-
-        # Find the index where PRES attains the value pmax between start_index and end_index
-        pmax_index = start_index + np.argmax(
-            ds["PRES"][start_index : end_index + 1].values == pmax
+    dive_numbers = ds[divenum_str].values
+    n_measurements = len(dive_numbers)
+    # Group by dive once; shared by the pmax search and the GPS counts below
+    dive_ids, dive_sizes = _dive_groups(dive_numbers)
+
+    # Assign phase 2 to all values up to and including the point where pmax is reached,
+    # and phase 1 to all values after pmax is reached
+    if divenum_str == "DIVE_NUMBER" and "dive_num_cast" in ds.variables:
+        # Reuse the down/up cast split already made by assign_profile_number
+        dive_num_cast = ds["dive_num_cast"].values
+        phase = np.where(dive_num_cast == dive_numbers, 2.0, 1.0)
+        phase[np.isnan(dive_num_cast)] = np.nan
+    else:
+        pmax_index = _dive_pmax_index(
+            dive_numbers, ds["PRES"].values, (dive_ids, dive_sizes)
         )
-
-        # Assign phase 2 to all values up to and including the point where pmax is reached
-        ds["PHASE"][start_index : pmax_index + 1] = 2
-
-        # Assign phase 1 to all values after pmax is reached
-        ds["PHASE"][pmax_index + 1 : end_index + 1] = 1
-
-        # Assign phase 3 to the time at the beginning of the dive, between the first valid TIME_GPS and the second valid TIME_GPS
-        valid_time_gps_indices = np.where(
-            ~np.isnan(ds["TIME_GPS"][start_index : end_index + 1].values)
-        )[0]
-        if len(valid_time_gps_indices) >= 2:
-            first_valid_index = start_index + valid_time_gps_indices[0]
-            second_valid_index = start_index + valid_time_gps_indices[1]
-            ds["PHASE"][first_valid_index : second_valid_index + 1] = 3
+        phase = np.where(np.arange(n_measurements) <= pmax_index, 2.0, 1.0)
+        phase[np.isnan(pmax_index)] = np.nan
+
+    # Assign phase 3 to the time at the beginning of the dive, between the first valid TIME_GPS and the second valid TIME_GPS
+    valid_gps = (~np.isnan(ds["TIME_GPS"].values)).astype(int)
+    # Count valid fixes per dive, and cumulatively within each dive (in dive order)
+    n_valid_dive = np.bincount(dive_ids, weights=valid_gps).astype(int)[dive_ids]
+    order = np.argsort(dive_ids, kind="stable")
+    cumsum_sorted = np.cumsum(valid_gps[order])
+    dive_starts = np.cumsum(dive_sizes) - dive_sizes
+    dive_offsets = (cumsum_sorted - valid_gps[order])[dive_starts]
+    n_valid_through = np.empty(n_measurements, dtype=int)
+    n_valid_through[order] = cumsum_sorted - np.repeat(dive_offsets, dive_sizes)
+    n_valid_before = n_valid_through - valid_gps
+    phase[
+        (n_valid_dive >= 2)
+        & (n_valid_through >= 1)
+        & (n_valid_before < 2)
+        & ~np.isnan(dive_numbers)
+    ] = 3
+
+    # PHASE_QC has no QC applied; int8 as for the other OG1 flag variables
+    ds = ds.assign(
+        PHASE=(["N_MEASUREMENTS"], phase),
+        PHASE_QC=(["N_MEASUREMENTS"], np.zeros(n_measurements, dtype=np.int8)),
+    )
 
     return ds
 
@@ -512,22 +556,21 @@ def calc_Z(ds: xr.Dataset) -> xr.Dataset:
         raise ValueError("Dataset must contain 'PRES' and 'LATITUDE' variables.")
 
     # Convert pressure to depth using gsw (pressure in dbar, latitude in degrees)
-    depth = gsw.z_from_p(
-        ds["PRES"], ds["LATITUDE"]
-    ).compute()  # Compute to handle dask arrays
+    depth = gsw.z_from_p(ds["PRES"].values, ds["LATITUDE"].values)
 
-    # Add depth to dataset
-    ds["DEPTH_Z"] = (["N_MEASUREMENTS"], depth.data)
     # Assign the calculated depth to a new variable in the dataset
-
-    ds["DEPTH_Z"].attrs = {
-        "units": "meters",
-        "positive": "up",
-        "standard_name": "depth",
-        "comment": "Depth calculated from pressure using gsw library, positive up.",
-    }
-
-    return ds
+    return ds.assign(
+        DEPTH_Z=(
+            ["N_MEASUREMENTS"],
+            depth,
+            {
+                "units": "meters",
+                "positive": "up",
+                "standard_name": "depth",
+                "comment": "Depth calculated from pressure using gsw library, positive up.",
+            },
+        )
+    )
 
 
 def get_sg_attrs(ds: xr.Dataset) -> dict:
@@ -566,23 +609,17 @@ def split_by_unique_dims(ds: xr.Dataset) -> dict:
         A dictionary mapping dimension tuples to datasets, each with variables sharing the same set of dimensions.
 
     """
-    # Dictionary to hold datasets with unique dimension sets
-    unique_dims_datasets = {}
+    # Dictionary to hold the variables of each unique dimension set
+    unique_dims_vars = {}
 
     # Iterate over the variables in the dataset
     for var_name, var_data in ds.data_vars.items():
-        # Get the dimensions of the variable
+        # Get the dimensions of the variable, and add it to the matching group
         dims = tuple(var_data.sizes)
+        unique_dims_vars.setdefault(dims, {})[var_name] = var_data
 
-        # If this dimension set is not in the dictionary, create a new dataset
-        if dims not in unique_dims_datasets:
-            unique_dims_datasets[dims] = xr.Dataset()
-
-        # Add the variable to the corresponding dataset
-        unique_dims_datasets[dims][var_name] = var_data
-
-    # Convert the dictionary values to a dictionary of datasets
-    return {dims: dataset for dims, dataset in unique_dims_datasets.items()}
+    # Build one dataset per dimension set
+    return {dims: xr.Dataset(variables) for dims, variables in unique_dims_vars.items()}
 
 
 def convert_units(ds: xr.Dataset) -> xr.Dataset:
@@ -594,39 +631,45 @@ def convert_units(ds: xr.Dataset) -> xr.Dataset:
     Parameters
     ----------
     ds
-        The dataset containing variables to convert.
+        The dataset containing variables to convert, named following the OG1 vocabulary.
 
     Returns
     -------
     xarray.Dataset
         The dataset with converted units.
 
-    """
-    """
-    Convert the units of variables in an xarray Dataset to preferred units.  This is useful, for instance, to convert cm/s to m/s.
-
-    Parameters
-    ----------
-    ds (xarray.Dataset): The dataset containing variables to convert.
+    Notes
+    -----
+    Converted variables are written to new arrays; `ds` itself is not modified.
 
-    Returns
-    -------
-    xarray.Dataset: The dataset with converted units.
     """
+    vocab_attrs = vocabularies.vocab_attrs
+    unit1_to_unit2 = vocabularies.unit1_to_unit2
+
+    # Only variables with units of their own and in the OG1 vocabulary can be converted
+    candidates = [
+        (var, da.attrs["units"], vocab_attrs[var]["units"])
+        for var, da in ds.data_vars.items()
+        if "units" in da.attrs and "units" in vocab_attrs.get(var, {})
+    ]
 
-    for var in ds.variables:
-        var_values = ds[var].values
-        orig_unit = ds[var].attrs.get("units")
-        if "units" in vocabularies.vocab_attrs[OG1_name]:
-            new_unit = vocabularies.vocab_attrs[OG1_name].get("units")
-            if orig_unit != new_unit:
-
-                var_values, new_unit = convert_units_var(
-                    var_values, orig_unit, new_unit
-                )
-
-                ds[var].values = var_values
-                ds[var].attrs["units"] = new_unit
+    # Collect the (variable, factor, new unit) conversions first, then apply them at once
+    conversions = []
+    for var, orig_unit, new_unit in candidates:
+        u1_to_u2 = reformat_units_str(orig_unit) + "_to_" + reformat_units_str(new_unit)
+        if u1_to_u2 in unit1_to_unit2:
+            factor = unit1_to_unit2[u1_to_u2]["factor"]
+            conversions.append((var, factor, new_unit))
+
+    # Scale into new arrays, so data shared with other datasets is left untouched
+    converted = {}
+    for var, factor, new_unit in conversions:
+        variable = ds.variables[var]
+        # copy() keeps dims, attrs and encoding; integer counts may become floats here
+        converted[var] = variable.copy(deep=False, data=variable.data * factor)
+        converted[var].attrs["units"] = new_unit
+    if converted:
+        ds = ds.assign(converted)
 
     return ds
 
@@ -763,10 +806,12 @@ def convert_qc_flags(dsa: xr.Dataset, qc_name: str) -> xr.Dataset:
     """
     # Must be called *after* var_name has OG1 long_name
     var_name = qc_name[:-3]
-    if qc_name in list(dsa):
+    if qc_name in dsa.data_vars:
         # Seaglider default type was a string.  Convert to int8 and take care of NaNs
         # dsa[qc_name].values = dsa[qc_name].values.astype("int8")
-        values = dsa[qc_name].values
+        # Work on the underlying variables to avoid building a DataArray per access
+        qc_var = dsa.variables[qc_name]
+        values = qc_var.values
         # Convert byte strings to regular strings (if necessary)
         if values.dtype.type is np.bytes_:
             values = values.astype(str)
@@ -775,23 +820,20 @@ def convert_qc_flags(dsa: xr.Dataset, qc_name: str) -> xr.Dataset:
         values = pd.to_numeric(
             values, errors="coerce"
         )  # Convert strings to numbers, NaNs stay NaNs
-        # Assign back to dataset
-        dsa[qc_name].values = values
         ### Set the nan values to 6 (unsampled flag) and convert to int8
         ### Before it had just set all values to 0, which is no change flag
         ### Alternative could be to set to 9 (missing value)
-        dsa[qc_name].values = dsa[qc_name].fillna(6).astype("int8")
+        qc_var.values = np.where(np.isnan(values), 6, values).astype("int8")
+        qc_attrs = qc_var.attrs
         # Seaglider default flag_meanings were prefixed with 'QC_'. Remove this prefix.
-        if "flag_meaning" in dsa[qc_name].attrs:
-            flag_meaning = dsa[qc_name].attrs["flag_meaning"]
-            dsa[qc_name].attrs["flag_meaning"] = flag_meaning.replace("QC_", "")
+        if "flag_meaning" in qc_attrs:
+            qc_attrs["flag_meaning"] = qc_attrs["flag_meaning"].replace("QC_", "")
         # Add a long_name attribute to the QC variable
-        dsa[qc_name].attrs["long_name"] = (
-            dsa[var_name].attrs.get("long_name", "") + " quality flag"
-        )
-        dsa[qc_name].attrs["standard_name"] = "status_flag"
+        var_attrs = dsa.variables[var_name].attrs
+        qc_attrs["long_name"] = var_attrs.get("long_name", "") + " quality flag"
+        qc_attrs["standard_name"] = "status_flag"
         # Mention the QC variable in the variable attributes
-        dsa[var_name].attrs["ancillary_variables"] = qc_name
+        var_attrs["ancillary_variables"] = qc_name
     return dsa
 
 
@@ -820,16 +862,18 @@ def find_best_dtype(var_name: str, da: xr.DataArray) -> type:
 
     """
     input_dtype = da.dtype.type
-    if "latitude" in var_name.lower() or "longitude" in var_name.lower():
+    var_name_lower = var_name.lower()
+    if "latitude" in var_name_lower or "longitude" in var_name_lower:
         return np.double
-    if var_name[-2:].lower() == "qc":
+    if var_name_lower[-2:] == "qc":
         return np.int8
-    if "time" in var_name.lower():
+    if "time" in var_name_lower:
         return input_dtype
-    if var_name[-3:] == "raw" or "int" in str(input_dtype):
-        if np.nanmax(da.values) < 2**16 / 2:
+    if var_name[-3:] == "raw" or da.dtype.kind in "iu":
+        max_value = np.nanmax(da.values)
+        if max_value < 2**16 / 2:
             return np.int16
-        elif np.nanmax(da.values) < 2**32 / 2:
+        elif max_value < 2**32 / 2:
             return np.int32
     if input_dtype == np.float64:
         return np.float32
@@ -850,7 +894,7 @@ def set_fill_value(new_dtype: type) -> int:
         The fill value calculated as 2^(bits-1) - 1.
 
     """
-    fill_val = 2 ** (int(re.findall(r"\d+", str(new_dtype))[0]) - 1) - 1
+    fill_val = 2 ** (np.dtype(new_dtype).itemsize * 8 - 1) - 1
     return fill_val
 
 
@@ -881,7 +925,7 @@ def set_best_dtype(ds: xr.Dataset) -> xr.Dataset:
         _log.debug(f"{var_name} input dtype {input_dtype} change to {new_dtype}")
         da_new = da.astype(new_dtype)
         ds = ds.drop_vars(var_name)
-        if "int" in str(new_dtype):
+        if np.dtype(new_dtype).kind in "iu":
             fill_val = set_fill_value(new_dtype)
             da_new[np.isnan(da)] = fill_val
             da_new.encoding["_FillValue"] = fill_val
@@ -915,7 +959,7 @@ def set_best_dtype_value(value, var_name: str):
 
     converted_value = np.array(value).astype(new_dtype)
 
-    if "int" in str(new_dtype) and np.isnan(value):
+    if np.dtype(new_dtype).kind in "iu" and np.isnan(value):
         fill_val = set_fill_value(new_dtype)
         converted_value = fill_val
 
@@ -1016,8 +1060,8 @@ def merge_parts_of_dataset(
         return time_var if time_var in ds.variables else None
 
     # Extract variables for each dimension
-    vars1 = {var: ds[var] for var in ds.variables if dim1 in ds[var].sizes}
-    vars2 = {var: ds[var] for var in ds.variables if dim2 in ds[var].sizes}
+    vars1 = {name: ds[name] for name, var in ds.variables.items() if dim1 in var.dims}
+    vars2 = {name: ds[name] for name, var in ds.variables.items() if dim2 in var.dims}
 
     # Create separate datasets
     new_ds1, new_ds2 = xr.Dataset(vars1), xr.Dataset(vars2)
@@ -1048,7 +1092,7 @@ def merge_parts_of_dataset(
         ### the dataset makes problems if variables are integers,
         ### so we convert to float before padding and back to int after padding
         for var in ds.variables:
-            if "int" in str(ds[var].dtype):
+            if ds.variables[var].dtype.kind in "iu":
                 ds[var] = ds[var].astype(float)
 
         pad_size = max_size - ds.sizes.get(dim1, 0)
@@ -1112,8 +1156,11 @@ def combine_two_dim_of_dataset(
         The updated dataset with merged variables.
     """
     # Drop all variables that have dim1 or dim2
+    dims_to_drop = {dim1, dim2}
     vars_to_drop = [
-        var for var in ds.variables if dim1 in ds[var].sizes or dim2 in ds[var].sizes
+        name
+        for name, var in ds.variables.items()
+        if not dims_to_drop.isdisjoint(var.dims)
     ]
     cleaned_ds = ds.drop_vars(vars_to_drop, errors="ignore")
     merged_ds = merge_parts_of_dataset(ds, dim1=dim1, dim2=dim2)
@@ -1226,22 +1273,26 @@ def add_hdm_parameters(ds_OG1, hdm_parameters):
             ds_updated[param_name].attrs = attributes
         # Check if it's dive-based (1 value per 2 profiles)
         elif np.size(values) > 1:
-            mapped_array = np.full(ds_updated.N_MEASUREMENTS.shape, np.nan)
-
-            # Iterate through dives (each dive = 2 profiles)
-            for dive, dive_val in zip(dive_numbers, values):
-                # Find all measurement indices belonging to these two profiles
-                if "DIVE_NUMBER" in ds_updated.data_vars:
-                    mask = ds_updated.DIVE_NUMBER == dive
-                elif "PROFILE_NUMBER" in ds_updated.data_vars:
-                    # Logic: Dive 1 = Profiles 1 & 2
-                    mask = (ds_updated.PROFILE_NUMBER == 2 * dive - 1) | (ds_updated.PROFILE_NUMBER == 2 * dive)
-                else:
-                    print(f"Error: No reference dimension for {param_name}. Skipping dive mapping.")
-                    break
-
-                # Fill the array for those specific measurements
-                mapped_array[mask] = dive_val
+            # Find the dive each measurement belongs to
+            if "DIVE_NUMBER" in ds_updated.data_vars:
+                measurement_dive = ds_updated.DIVE_NUMBER.values
+            elif "PROFILE_NUMBER" in ds_updated.data_vars:
+                # Logic: Dive 1 = Profiles 1 & 2
+                profile = ds_updated.PROFILE_NUMBER.values
+                measurement_dive = np.where(profile % 1 == 0, np.ceil(profile / 2), np.nan)
+            else:
+                print(f"Error: No reference dimension for {param_name}. Skipping dive mapping.")
+                measurement_dive = np.full(ds_updated.N_MEASUREMENTS.shape, np.nan)
+
+            # Look up the value of each dive (each dive = 2 profiles) in one pass
+            dives = np.asarray(dive_numbers).ravel()
+            dive_vals = np.asarray(values).ravel()
+            n_dives = min(len(dives), len(dive_vals))
+            dive_lookup = pd.Series(dive_vals[:n_dives], index=dives[:n_dives])
+            dive_lookup = dive_lookup[~dive_lookup.index.duplicated(keep="last")]
+            mapped_array = (
+                pd.Series(measurement_dive).map(dive_lookup).to_numpy(dtype=float)
+            )
 
             # Add to dataset with the N_MEASUREMENTS dimension
             ds_updated[param_name] = (("N_MEASUREMENTS",), mapped_array)
@@ -3,12 +3,16 @@ import datetime
 import logging
 import re
 
+import numpy as np
 import xarray as xr
 
 # from votoutils.upload.sync_functions import sync_script_dir
 
 _log = logging.getLogger(__name__)
 
+# Characters removed from time strings by _clean_time_string
+_time_separators = str.maketrans("", "", "_:-")
+
 
 def _validate_coords(ds1: xr.Dataset) -> xr.Dataset:
     """Validates and assigns coordinates to the given xarray Dataset.
@@ -37,14 +41,14 @@ def _validate_coords(ds1: xr.Dataset) -> xr.Dataset:
     id = ds1.attrs["id"]
     if "longitude" not in ds1.coords:
         ds1 = ds1.assign_coords(
-            longitude=("sg_data_point", [float("nan")] * ds1.dims["sg_data_point"])
+            longitude=("sg_data_point", np.full(ds1.sizes["sg_data_point"], np.nan))
         )
         _log.warning(
             f"{id}: No coord longitude - adding as NaNs to length of sg_data_point"
         )
     if "latitude" not in ds1.coords:
         ds1 = ds1.assign_coords(
-            latitude=("sg_data_point", [float("nan")] * ds1.dims["sg_data_point"])
+            latitude=("sg_data_point", np.full(ds1.sizes["sg_data_point"], np.nan))
         )
         _log.warning(
             f"{id}: No coord latitude - adding as NaNs to length of sg_data_point"
@@ -178,7 +182,24 @@ def _clean_time_string(time_str: str) -> str:
         Cleaned time string with underscores, colons, hyphens, and 'Z' removed.
 
     """
-    return time_str.replace("_", "").replace(":", "").rstrip("Z").replace("-", "")
+    return time_str.translate(_time_separators).rstrip("Z")
+
+
+def _first_valid(values: np.ndarray):
+    """Returns the first element of a 1-D array that is not NaN (or NaT).
+
+    Parameters
+    ----------
+    values
+        The array to search.
+
+    Returns
+    -------
+    scalar
+        The first valid element, or the first element if none are valid.
+
+    """
+    return values[np.argmax(~np.isnan(values))]
 
 
 def _clean_anc_vars_list(ancillary_variables_str: str) -> list[str]:
@@ -218,12 +239,127 @@ def _assign_calval(sg_cal: xr.Dataset, anc_var_list: list[str]) -> dict:
         Missing variables are assigned 'Unknown'.
 
     """
+    # Read the underlying variables directly, without building a DataArray per name
+    variables = sg_cal.variables
     calval = {}
     for anc_var in anc_var_list:
         # Check if anc_var exists in sg_cal which was not the case in Robs dataset
-        if anc_var in sg_cal:
-            var_value = sg_cal[anc_var].values.item()
-            calval[anc_var] = var_value
+        if anc_var in variables:
+            calval[anc_var] = variables[anc_var].values.item()
         else:
             calval[anc_var] = "Unknown"
     return calval
+
+
+def _missing_values(dtype: np.dtype, length: int) -> np.ndarray:
+    """Creates a missing-value array to stand in for a variable absent from a dataset.
+
+    Parameters
+    ----------
+    dtype
+        The dtype of the variable in the datasets where it is present.
+    length
+        Length of the array to create.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of NaT for datetimes, otherwise NaN. Integers are promoted to float
+        (float32 up to 16-bit, float64 above) and other dtypes to object, as xarray
+        does when filling missing values.
+
+    """
+    if dtype.kind in "mM":
+        return np.full(length, np.datetime64("NaT"), dtype=dtype)
+    if dtype.kind in "fc":
+        return np.full(length, np.nan, dtype=dtype)
+    if dtype.kind in "iu":
+        return np.full(
+            length, np.nan, dtype=np.float32 if dtype.itemsize <= 2 else float
+        )
+    return np.full(length, np.nan, dtype=object)
+
+
+def _concat_sorted_by_time(
+    datasets: list[xr.Dataset], dim: str = "N_MEASUREMENTS", time_var: str = "TIME"
+) -> xr.Dataset:
+    """Concatenates datasets along a dimension and sorts the result by time.
+
+    Equivalent to ``xr.concat(datasets, dim=dim, data_vars="all").sortby(time_var)``,
+    but concatenates the underlying arrays directly and applies the time ordering
+    once per variable.
+
+    Parameters
+    ----------
+    datasets
+        Datasets to concatenate.
+    dim, optional
+        The dimension to concatenate along. Default is 'N_MEASUREMENTS'.
+    time_var, optional
+        The variable to sort by. Default is 'TIME'.
+
+    Returns
+    -------
+    xarray.Dataset
+        The concatenated dataset, sorted by `time_var`.
+
+    Notes
+    -----
+    - Variables missing from a dataset are filled with NaN (NaT for times).
+    - Attributes and encoding are taken from the first dataset holding each variable,
+      and global attributes from the first dataset.
+    - The sort is skipped when the concatenated times are already in order.
+    - A single dataset is not copied, only sorted if needed.
+    - Falls back to ``xr.concat`` if any variable is not one-dimensional along `dim`.
+
+    """
+    if any(var.dims != (dim,) for ds in datasets for var in ds.variables.values()):
+        return xr.concat(datasets, dim=dim, data_vars="all").sortby(time_var)
+
+    if len(datasets) == 1:
+        # Nothing to concatenate: only sort if needed
+        ds = datasets[0]
+        time = ds[time_var].values
+        if not (time[1:] >= time[:-1]).all():
+            ds = ds.sortby(time_var)
+        # Same layout as the concatenated result: data variables, then coordinates
+        return xr.Dataset(
+            {name: ds.variables[name].copy(deep=False) for name in ds.data_vars},
+            coords={name: ds.variables[name].copy(deep=False) for name in ds.coords},
+            attrs=dict(ds.attrs),
+        )
+
+    lengths = [ds.sizes[dim] for ds in datasets]
+    names = list(dict.fromkeys(name for ds in datasets for name in ds.variables))
+    coord_names = {name for ds in datasets for name in ds.coords}
+
+    time = np.concatenate([ds[time_var].values for ds in datasets])
+    if (time[1:] >= time[:-1]).all():
+        # Already in time order (NaN/NaT compare False, so they always sort)
+        order = slice(None)
+    else:
+        order = np.argsort(time, kind="stable")
+
+    data_vars = {}
+    coords = {}
+    for name in names:
+        first = next(ds.variables[name] for ds in datasets if name in ds.variables)
+        values = np.concatenate(
+            [
+                (
+                    ds.variables[name].values
+                    if name in ds.variables
+                    else _missing_values(first.dtype, length)
+                )
+                for ds, length in zip(datasets, lengths)
+            ]
+        )
+        var = xr.Variable(
+            (dim,), values[order], dict(first.attrs), dict(first.encoding)
+        )
+        if name in coord_names:
+            coords[name] = var
+        else:
+            data_vars[name] = var
+
+    return xr.Dataset(data_vars, coords=coords, attrs=dict(datasets[0].attrs))
@@ -6,12 +6,20 @@ import xarray as xr
 
 _log = logging.getLogger(__name__)
 
+# Attribute value types that can be written to NetCDF as they are (bool excluded)
+_valid_attr_types = (str, Number, np.ndarray, np.number, list, tuple)
 
-def save_dataset(ds: xr.Dataset, output_file: str = "../test.nc") -> None:
+
+def save_dataset(
+    ds: xr.Dataset,
+    output_file: str = "../test.nc",
+    compress: bool = True,
+    complevel: int = 1,
+) -> None:
     """Attempts to save the dataset to a NetCDF file.
 
-    If a TypeError occurs due to invalid attribute values, converts the invalid
-    attributes to strings and retries the save operation.
+    Attribute values that cannot be written to NetCDF are converted to strings
+    on a shallow copy before the save operation; the input dataset is unchanged.
 
     Parameters
     ----------
@@ -19,6 +27,11 @@ def save_dataset(ds: xr.Dataset, output_file: str = "../test.nc") -> None:
         The dataset to be saved.
     output_file : str, optional
         The path to the output NetCDF file. Defaults to '../test.nc'.
+    compress : bool, optional
+        If True, write numeric variables along N_MEASUREMENTS chunked and
+        zlib-compressed. Defaults to True.
+    complevel : int, optional
+        The zlib compression level (1-9) used when `compress` is True. Defaults to 1.
 
     Returns
     -------
@@ -30,8 +43,6 @@ def save_dataset(ds: xr.Dataset, output_file: str = "../test.nc") -> None:
     Based on: https://github.com/pydata/xarray/issues/3743
 
     """
-    valid_types = (str, Number, np.ndarray, np.number, list, tuple)
-
     for varname in ds.variables:
         var = ds[varname]
         if np.issubdtype(var.dtype, np.datetime64):
@@ -43,33 +54,80 @@ def save_dataset(ds: xr.Dataset, output_file: str = "../test.nc") -> None:
                         f"Moved '{key}' from attrs to encoding for variable '{varname}'."
                     )
 
+    # Compression is set on a shallow copy, leaving the caller's encoding untouched
+    ds_out = ds.copy(deep=False)
+    if compress:
+        for var in ds_out.variables.values():
+            if var.dims == ("N_MEASUREMENTS",) and var.dtype.kind in "biufM":
+                var.encoding.update(_compression_encoding(var, complevel))
+
+    # Attributes are sanitized on the copy, so the caller's attrs are not converted
+    for varname, variable in ds_out.variables.items():
+        invalid_attrs = [k for k, v in variable.attrs.items() if not _is_valid_attr(v)]
+        for k in invalid_attrs:
+            v = variable.attrs[k]
+            _log.warning(
+                f"For variable '{varname}': Converting attribute '{k}' with value '{v}' to string."
+            )
+            variable.attrs[k] = str(v)
+
     try:
-        ds.to_netcdf(output_file, format="NETCDF4")
+        ds_out.to_netcdf(output_file, format="NETCDF4")
         return True
 
     except TypeError as e:
-        _log.error(f"TypeError saving dataset: {e.__class__.__name__}: {e}")
+        _log.error(f"Failed to save dataset: {e}")
+        datetime_vars = [
+            var for var in ds.variables if ds[var].dtype == "datetime64[ns]"
+        ]
+        _log.warning(f"Variables with dtype datetime64[ns]: {datetime_vars}")
+        float_attrs = [attr for attr in ds.attrs if isinstance(ds.attrs[attr], float)]
+        _log.warning(f"Attributes with dtype float64: {float_attrs}")
+        return False
 
-        for varname, variable in ds.variables.items():
-            for k, v in variable.attrs.items():
-                if not isinstance(v, valid_types) or isinstance(v, bool):
-                    _log.warning(
-                        f"For variable '{varname}': Converting attribute '{k}' with value '{v}' to string."
-                    )
-                    variable.attrs[k] = str(v)
-
-        try:
-            ds.to_netcdf(output_file, format="NETCDF4")
-            return True
-
-        except Exception as e:
-            _log.error(f"Failed to save dataset: {e}")
-            datetime_vars = [
-                var for var in ds.variables if ds[var].dtype == "datetime64[ns]"
-            ]
-            _log.warning(f"Variables with dtype datetime64[ns]: {datetime_vars}")
-            float_attrs = [
-                attr for attr in ds.attrs if isinstance(ds.attrs[attr], float)
-            ]
-            _log.warning(f"Attributes with dtype float64: {float_attrs}")
-            return False
+
+def _is_valid_attr(value) -> bool:
+    """Checks whether an attribute value can be written to NetCDF as it is.
+
+    Parameters
+    ----------
+    value
+        The attribute value to check.
+
+    Returns
+    -------
+    bool
+        True for strings, numbers, arrays, lists and tuples, except booleans.
+
+    """
+    if type(value) is str:
+        return True
+    return isinstance(value, _valid_attr_types) and not isinstance(value, bool)
+
+
+def _compression_encoding(var: xr.Variable, complevel: int = 1) -> dict:
+    """Builds the NetCDF4 chunking and compression encoding for a 1-D variable.
+
+    Chunks hold up to 65536 values, capped at the length of the variable.
+
+    Parameters
+    ----------
+    var : xarray.Variable
+        The one-dimensional variable to be written.
+    complevel : int, optional
+        The zlib compression level. Defaults to 1.
+
+    Returns
+    -------
+    dict
+        Encoding entries to merge into the variable's existing encoding.
+
+    """
+    chunksize = max(1, min(var.size, 65536))
+    return {
+        "zlib": True,
+        "complevel": complevel,
+        "shuffle": True,
+        "contiguous": False,
+        "chunksizes": (chunksize,),
+    }
@@ -62,3 +62,18 @@ def test_process_dataset():
     meanZ = ds_new["DEPTH_Z"].mean().item()
     meanZpos = ds_new["DEPTH"].mean().item()
     assert abs(meanZ + meanZpos) < 10
+
+
+def test_get_time_attributes():
+
+    ds1 = readers.load_sample_dataset()
+
+    time_attrs = convertOG1.get_time_attributes(ds1, date_modified="20250101T000000")
+    assert time_attrs["date_modified"] == "20250101T000000"
+    assert "-" not in time_attrs["time_coverage_start"]
+    assert "start_date" in time_attrs
+
+    # Numeric (epoch seconds) time attributes are formatted in UTC
+    ds1.attrs["time_coverage_start"] = 1212777127
+    time_attrs = convertOG1.get_time_attributes(ds1)
+    assert time_attrs["time_coverage_start"] == "20080606T183207"
@@ -38,6 +38,20 @@ def test_convert_units_var():
         assert converted_values == new_value
 
 
+def test_convert_units():
+    dataset = xr.Dataset(
+        {
+            "GLIDE_SPEED": ("N_MEASUREMENTS", np.array([100.0, 50.0]), {"units": "cm/s"}),
+            "PRES": ("N_MEASUREMENTS", np.array([1.0, 2.0]), {"units": "dbar"}),
+        }
+    )
+    converted = tools.convert_units(dataset)
+
+    assert np.allclose(converted["GLIDE_SPEED"].values, [1.0, 0.5])
+    assert converted["GLIDE_SPEED"].attrs["units"] == "m s-1"
+    assert np.array_equal(converted["PRES"].values, dataset["PRES"].values)
+
+
 def test_calc_z():
     pressure_values = np.arange(10, 10000, 10)
     # Create a dummy xarray dataset with correct coordinates
@@ -66,3 +80,28 @@ def test_add_hdm_parameters():
     ### check if the hdm parameters are added to the dataset and have the expected values
     for param in hdm_parameters:
         assert param in ds_OG1
+
+
+def test_assign_phase():
+    # Two dives: pressure peaks at index 2 and index 6, GPS fixes at 0, 1 and 4, 5
+    dataset = xr.Dataset(
+        {
+            "DIVE_NUMBER": ("N_MEASUREMENTS", [1, 1, 1, 1, 2, 2, 2, 2]),
+            "PRES": ("N_MEASUREMENTS", [0, 5, 10, 4, np.nan, 3, 9, 1.0]),
+            "TIME_GPS": (
+                "N_MEASUREMENTS",
+                [1.0, 2.0, np.nan, np.nan, 3.0, 4.0, np.nan, np.nan],
+            ),
+        }
+    )
+    phase = tools.assign_phase(dataset)["PHASE"].values
+
+    assert np.array_equal(phase, [3, 3, 2, 1, 3, 3, 2, 1])
+
+    # Reusing dive_num_cast from assign_profile_number gives the same phases
+    dataset = dataset.assign(
+        dive_num_cast=("N_MEASUREMENTS", [1, 1, 1, 1.5, 2, 2, 2, 2.5])
+    )
+    phase = tools.assign_phase(dataset)["PHASE"].values
+
+    assert np.array_equal(phase, [3, 3, 2, 1, 3, 3, 2, 1])
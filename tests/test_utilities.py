@@ -161,3 +161,54 @@ def test_parse_calibcomm():
 
         assert caldate == caldate1
         assert serialnum == serialnum1
+
+
+def test_concat_sorted_by_time():
+    """Test function for the `utilities._concat_sorted_by_time` function.
+    This function creates two dummy xarray datasets with interleaved times and
+    partially overlapping variables.
+    Asserts:
+        - The result is identical to `xr.concat` followed by `sortby("TIME")`.
+    """
+    times = np.array(
+        ["2008-06-06T18:00", "2008-06-06T18:10", "2008-06-06T18:20"],
+        dtype="datetime64[ns]",
+    )
+    ds1 = xr.Dataset(
+        {
+            "TEMP": (
+                "N_MEASUREMENTS",
+                np.array([10.0, 9.0, 8.0], dtype="float32"),
+                {"units": "Celsius"},
+            ),
+            "TEMP_QC": ("N_MEASUREMENTS", np.array([1, 1, 4], dtype="int8")),
+        },
+        coords={"TIME": ("N_MEASUREMENTS", times)},
+        attrs={"id": "testID"},
+    )
+    ds2 = xr.Dataset(
+        {"TIME_GPS": ("N_MEASUREMENTS", times[:2] + np.timedelta64(5, "m"))},
+        coords={"TIME": ("N_MEASUREMENTS", times[:2] + np.timedelta64(5, "m"))},
+    )
+
+    expected = xr.concat([ds1, ds2], dim="N_MEASUREMENTS", data_vars="all").sortby(
+        "TIME"
+    )
+    result = utilities._concat_sorted_by_time([ds1, ds2])
+
+    xr.testing.assert_identical(result, expected)
+    for var in expected.variables:
+        assert result[var].dtype == expected[var].dtype
+
+    # Inputs already in time order are concatenated without reordering
+    ds3 = ds1.assign_coords(TIME=ds1["TIME"] + np.timedelta64(1, "h"))
+    expected = xr.concat([ds1, ds3], dim="N_MEASUREMENTS", data_vars="all").sortby(
+        "TIME"
+    )
+    xr.testing.assert_identical(utilities._concat_sorted_by_time([ds1, ds3]), expected)
+
+    # A single dataset is passed through in time order
+    expected = ds2.sortby("TIME")
+    xr.testing.assert_identical(
+        utilities._concat_sorted_by_time([ds2.isel(N_MEASUREMENTS=[1, 0])]), expected
+    )
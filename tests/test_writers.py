@@ -0,0 +1,47 @@
+import pathlib
+import sys
+
+script_dir = pathlib.Path(__file__).parent.absolute()
+parent_dir = script_dir.parents[0]
+sys.path.append(str(parent_dir))
+
+from seagliderOG1 import writers
+import netCDF4
+import numpy as np
+import xarray as xr
+
+
+def test_save_dataset_leaves_encoding_unchanged(tmp_path):
+    time = np.datetime64("2024-01-01", "ns") + np.arange(100) * np.timedelta64(1, "s")
+    ds = xr.Dataset(
+        {
+            "TEMP": ("N_MEASUREMENTS", np.arange(100.0)),
+            "TIME": ("N_MEASUREMENTS", time),
+        }
+    )
+    ds["TEMP"].encoding = {"dtype": "float32"}
+    ds["TIME"].encoding = {
+        "units": "seconds since 1970-01-01T00:00:00+00:00",
+        "calendar": "gregorian",
+    }
+    encoding_before = dict(ds["TEMP"].encoding)
+
+    compressed = tmp_path / "compressed.nc"
+    assert writers.save_dataset(ds, str(compressed), compress=True, complevel=4)
+    assert ds["TEMP"].encoding == encoding_before
+    with netCDF4.Dataset(compressed) as nc:
+        filters = nc["TEMP"].filters()
+        assert filters["zlib"] and filters["complevel"] == 4
+        # The variables' own encoding is kept alongside the compression
+        assert nc["TEMP"].dtype == np.float32
+        assert nc["TIME"].units == "seconds since 1970-01-01T00:00:00+00:00"
+        assert nc["TIME"].calendar == "gregorian"
+
+    # A later uncompressed save is not affected by the earlier one
+    uncompressed = tmp_path / "uncompressed.nc"
+    assert writers.save_dataset(ds, str(uncompressed), compress=False)
+    assert ds["TEMP"].encoding == encoding_before
+    with netCDF4.Dataset(uncompressed) as nc:
+        assert not nc["TEMP"].filters()["zlib"]
+        assert nc["TEMP"].dtype == np.float32
+        assert nc["TIME"].units == "seconds since 1970-01-01T00:00:00+00:00"